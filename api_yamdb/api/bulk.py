@@ -0,0 +1,140 @@
+from django.db import connection, transaction
+
+from .cache import categories, genres, list_cache, title_cache
+from .serializers import TitleCreateSerializer
+from titles.models import Category, Genre, GenreTitle, Title
+
+BULK_MAX_TITLES = 1000
+BULK_BATCH_SIZE = 500
+
+CREATED, UPDATED, ERROR = 'created', 'updated', 'error'
+
+
+def is_title_id(value):
+    """Целое в диапазоне первичного ключа; true и false id не считаются."""
+    return (isinstance(value, int) and not isinstance(value, bool)
+            and 0 < value < 2 ** 63)
+
+
+def collect_slugs(items, field, many=False):
+    """Все slug поля по пачке без повторов."""
+    slugs = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        values = item.get(field)
+        if not many:
+            values = [values]
+        if isinstance(values, list):
+            slugs.update(
+                (slug, None) for slug in values if isinstance(slug, str)
+            )
+    return list(slugs)
+
+
+def resolve_slugs(items):
+    """Общие для пачки slug→объект из реестров категорий и жанров."""
+    return {
+        Category: categories.instances(collect_slugs(items, 'category')),
+        Genre: genres.instances(collect_slugs(items, 'genre', many=True)),
+    }
+
+
+def validate_item(item, existing, seen, context):
+    """Проверяет элемент пачки: (произведение, данные) или ошибки.
+
+    `seen` — id, уже измененные предыдущими элементами пачки: второе
+    изменение того же произведения отклоняется.
+    """
+    if not isinstance(item, dict):
+        return None, {'non_field_errors': ['Ожидался объект произведения.']}
+    title = None
+    if 'id' in item:
+        if not is_title_id(item['id']):
+            return None, {'id': ['Ожидался целочисленный id.']}
+        if item['id'] in seen:
+            return None, {'id': ['Произведение уже изменено в этой пачке.']}
+        title = existing.get(item['id'])
+        if title is None:
+            return None, {'id': ['Произведение не найдено.']}
+    serializer = TitleCreateSerializer(title, data=item,
+                                       partial=title is not None,
+                                       context=context)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    return (title, dict(serializer.validated_data)), None
+
+
+def bulk_save_titles(items, context):
+    """Проверяет пачку произведений и сохраняет прошедшие проверку.
+
+    Элементы с `id` обновляют существующие произведения, остальные
+    создаются. Все изменения пишутся в одной транзакции пачками
+    `bulk_create` и `bulk_update`. Возвращает результат для каждого
+    элемента в порядке запроса.
+    """
+    context = {**context, 'resolved_slugs': resolve_slugs(items)}
+    existing = Title.objects.in_bulk([
+        item['id'] for item in items
+        if isinstance(item, dict) and is_title_id(item.get('id'))
+    ])
+    results, seen = [], set()
+    created, updated, update_fields = [], [], set()
+    for index, item in enumerate(items):
+        result = {'index': index}
+        results.append(result)
+        valid, errors = validate_item(item, existing, seen, context)
+        if errors:
+            result.update(status=ERROR, errors=errors)
+            continue
+        title, data = valid
+        genre_ids = data.pop('genre', None)
+        if genre_ids is not None:
+            genre_ids = {genre.pk for genre in genre_ids}
+        if title is None:
+            created.append((Title(**data), genre_ids, result))
+            continue
+        seen.add(title.pk)
+        for field, value in data.items():
+            setattr(title, field, value)
+        update_fields.update(data)
+        updated.append((title, genre_ids, result))
+    save_titles(created, updated, update_fields)
+    for status, saved in ((CREATED, created), (UPDATED, updated)):
+        for title, _, result in saved:
+            result.update(status=status, id=title.pk)
+    title_cache.invalidate([title.pk for title, _, _ in updated])
+    list_cache.bump(Title)
+    return results
+
+
+def save_titles(created, updated, update_fields):
+    """Пишет новые и измененные произведения с жанрами в одной транзакции."""
+    with transaction.atomic():
+        insert_titles([title for title, _, _ in created])
+        if update_fields:
+            Title.objects.bulk_update(
+                [title for title, _, _ in updated], update_fields,
+                batch_size=BULK_BATCH_SIZE
+            )
+        GenreTitle.objects.filter(title__in=[
+            title for title, genre_ids, _ in updated if genre_ids is not None
+        ]).delete()
+        GenreTitle.objects.bulk_create((
+            GenreTitle(title=title, genre_id=genre_id)
+            for title, genre_ids, _ in created + updated
+            for genre_id in genre_ids or ()
+        ), batch_size=BULK_BATCH_SIZE)
+
+
+def insert_titles(titles):
+    """Вставляет произведения пачками, если база возвращает их id.
+
+    Иначе, как у SQLite в Django 3.2, сохраняет по одному, но в той же
+    транзакции.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(titles, batch_size=BULK_BATCH_SIZE)
+        return
+    for title in titles:
+        title.save()
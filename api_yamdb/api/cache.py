@@ -0,0 +1,274 @@
+import hashlib
+import threading
+import time
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+
+from reviews.models import Review
+from titles.models import Category, Genre, Title
+
+INVALIDATE_CHUNK_SIZE = 1000
+
+
+class TitleCache:
+    """Кеш сериализованных произведений с счетчиками попаданий."""
+
+    key_prefix = 'title'
+    stats_keys = ('hits', 'misses')
+
+    @property
+    def cache(self):
+        return caches[settings.TITLE_CACHE_ALIAS]
+
+    def key(self, title_id):
+        return f'{self.key_prefix}:{title_id}'
+
+    def get(self, title_id):
+        data = self.cache.get(self.key(title_id))
+        self.count('misses' if data is None else 'hits')
+        return data
+
+    def get_many(self, title_ids):
+        """Возвращает словарь {id: данные} для найденных в кеше."""
+        found = self.cache.get_many([self.key(pk) for pk in title_ids])
+        cached = {pk: found[self.key(pk)]
+                  for pk in title_ids if self.key(pk) in found}
+        self.count('hits', len(cached))
+        self.count('misses', len(title_ids) - len(cached))
+        return cached
+
+    def set(self, title_id, data):
+        self.cache.set(self.key(title_id), data,
+                       settings.TITLE_CACHE_TIMEOUT)
+
+    def set_many(self, items):
+        self.cache.set_many(
+            {self.key(pk): data for pk, data in items.items()},
+            settings.TITLE_CACHE_TIMEOUT
+        )
+
+    def invalidate(self, title_ids):
+        self.cache.delete_many([self.key(pk) for pk in title_ids])
+
+    def count(self, name, delta=1):
+        if not delta:
+            return
+        key = self.key(f'stats:{name}')
+        try:
+            self.cache.incr(key, delta)
+        except ValueError:
+            self.cache.set(key, delta, None)
+
+    def stats(self):
+        values = self.cache.get_many(
+            [self.key(f'stats:{name}') for name in self.stats_keys]
+        )
+        return {name: values.get(self.key(f'stats:{name}'), 0)
+                for name in self.stats_keys}
+
+
+class ListCache:
+    """Кеш ответов списков, версионируемый счетчиками поколений моделей.
+
+    Любая запись в модель сдвигает ее поколение, и все страницы,
+    построенные по старому поколению, перестают находиться без обхода
+    ключей. Поколение хранит время последнего изменения в наносекундах,
+    поэтому по нему же строятся ETag и Last-Modified. Поколение может
+    быть общим для модели или ограничено родителем, например отзывами
+    одного произведения.
+    """
+
+    key_prefix = 'list'
+
+    @property
+    def cache(self):
+        return caches[settings.LIST_CACHE_ALIAS]
+
+    def generation_key(self, model, scope=None):
+        key = f'generation:{model._meta.label_lower}'
+        if scope is not None:
+            key = f'{key}:{scope}'
+        return key
+
+    def generations(self, scopes):
+        keys = [self.generation_key(model, scope) for model, scope in scopes]
+        values = self.cache.get_many(keys)
+        for key in keys:
+            if key not in values:
+                # Вытесненное поколение считается изменившимся сейчас.
+                self.cache.add(key, time.time_ns(), None)
+                values[key] = self.cache.get(key)
+        return [values[key] for key in keys]
+
+    def bump(self, *models, scope=None):
+        for model in models:
+            key = self.generation_key(model, scope)
+            self.cache.set(
+                key, max(time.time_ns(), (self.cache.get(key) or 0) + 1), None
+            )
+
+    def state(self, view, request):
+        """Хеш запроса с поколениями и время последнего изменения."""
+        params = sorted(
+            (name, sorted(filter(None, request.query_params.getlist(name))))
+            for name in view.get_cache_params()
+            if any(request.query_params.getlist(name))
+        )
+        scopes = view.get_cache_scopes()
+        generations = self.generations(scopes)
+        # Ответ под этим ключом строится по реестрам того же поколения.
+        for (model, scope), generation in zip(scopes, generations):
+            if scope is None and model in TAXONOMY_REGISTRIES:
+                TAXONOMY_REGISTRIES[model].refresh(generation=generation)
+        raw = repr((
+            request.build_absolute_uri(request.path),
+            params,
+            generations,
+        ))
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return digest, max(generations) // 10 ** 9
+
+    def key(self, view, digest):
+        return f'{self.key_prefix}:{view.basename}:{digest}'
+
+    def body_key(self, key, media_type, encoding):
+        """Ключ сжатого тела ответа, сохраненного по ключу `key`."""
+        return f'{key}:{media_type}:{encoding}'
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        self.cache.set(key, data, settings.LIST_CACHE_TIMEOUT)
+
+
+class TaxonomyRegistry:
+    """Все категории или жанры в памяти процесса.
+
+    Реестр загружается одним запросом и отвечает на проверку slug, поиск
+    id и вложенное представление без SQL. Свои изменения процесс узнает
+    из сигналов, чужие — по поколению модели в общем кеше списков,
+    которое сверяется не чаще раза в `check_interval` секунд, а перед
+    ответом, попадающим в кеш или ETag, — по поколению его ключа. Неизвестный
+    slug перед отказом проверяется повторной загрузкой реестра: его мог
+    только что создать другой процесс.
+    """
+
+    fields = ('name', 'slug')
+    check_interval = 1
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.entries = {}, {}
+        self.invalidate()
+
+    def __deepcopy__(self, memo):
+        # Поля сериализаторов копируются вместе с аргументами, а реестр
+        # должен оставаться общим для процесса.
+        return self
+
+    def invalidate(self):
+        self.version = None
+        self.checked = 0
+
+    def refresh(self, force=False, generation=None):
+        """Перечитывает реестр, если сменилось поколение модели.
+
+        Поколение, уже прочитанное для ключа кеша или ETag, передается
+        в `generation` и сверяется сразу, без `check_interval`.
+        """
+        now = time.monotonic()
+        if generation is None:
+            if not force and now - self.checked < self.check_interval:
+                return
+            generation, = list_cache.generations([(self.model, None)])
+        with self.lock:
+            if (force or self.version is None
+                    or generation > self.version):
+                by_id = {
+                    row.pop('pk'): row for row in self.model.objects.values(
+                        'pk', *self.fields
+                    )
+                }
+                self.entries = by_id, {
+                    row['slug']: pk for pk, row in by_id.items()
+                }
+                self.version = generation
+            self.checked = now
+
+    def representation(self, pk):
+        """Данные объекта в виде вложенного сериализатора или None."""
+        if pk is None:
+            return None
+        self.refresh()
+        if pk not in self.entries[0]:
+            self.refresh(force=True)
+        representation = self.entries[0].get(pk)
+        return None if representation is None else dict(representation)
+
+    def representations(self, pks):
+        """Представления объектов по id, отсортированные по названию."""
+        return sorted(
+            filter(None, map(self.representation, pks)),
+            key=itemgetter('name')
+        )
+
+    def lookup(self, slugs):
+        """Словари реестра, перечитанные один раз при неизвестном slug."""
+        self.refresh()
+        if any(slug not in self.entries[1] for slug in slugs):
+            self.refresh(force=True)
+        return self.entries
+
+    def ids(self, slugs):
+        """Id известных slug, неизвестные пропускаются."""
+        _, by_slug = self.lookup(slugs)
+        return [by_slug[slug] for slug in slugs if slug in by_slug]
+
+    def instance(self, slug):
+        """Объект модели по slug, как загруженный из базы, или None."""
+        return self.instances([slug])[slug]
+
+    def instances(self, slugs):
+        """Словарь slug→объект или None для неизвестных slug."""
+        by_id, by_slug = self.lookup(slugs)
+        return {
+            slug: self.build(by_slug[slug], by_id[by_slug[slug]])
+            if slug in by_slug else None
+            for slug in slugs
+        }
+
+    def build(self, pk, representation):
+        return self.model.from_db(
+            router.db_for_write(self.model),
+            (self.model._meta.pk.attname, *self.fields),
+            (pk, *representation.values())
+        )
+
+
+title_cache = TitleCache()
+list_cache = ListCache()
+categories = TaxonomyRegistry(Category)
+genres = TaxonomyRegistry(Genre)
+TAXONOMY_REGISTRIES = {Category: categories, Genre: genres}
+
+
+def invalidate_all():
+    """Сбрасывает кеши после массовых изменений, прошедших мимо сигналов."""
+    list_cache.bump(Title, Category, Genre, Review)
+    for registry in TAXONOMY_REGISTRIES.values():
+        registry.invalidate()
+    title_ids = Title.objects.values_list('pk', flat=True).iterator(
+        chunk_size=INVALIDATE_CHUNK_SIZE
+    )
+    chunk = []
+    for title_id in title_ids:
+        chunk.append(title_id)
+        if len(chunk) == INVALIDATE_CHUNK_SIZE:
+            title_cache.invalidate(chunk)
+            chunk = []
+    title_cache.invalidate(chunk)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Бэкенды, данные которых видит только процесс, записавший их.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Предупреждает, если кеши произведений и поколений не общие."""
+    warnings = []
+    for setting in ('TITLE_CACHE_ALIAS', 'LIST_CACHE_ALIAS'):
+        alias = getattr(settings, setting)
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if backend in PROCESS_LOCAL_CACHES:
+            warnings.append(Warning(
+                f'{setting}: кеш `{alias}` ({backend}) не общий для '
+                f'процессов сервера.',
+                hint='При нескольких процессах остальные не увидят сброса '
+                     'кеша и поколений моделей и будут отдавать устаревшие '
+                     'ответы и 304. Настройте memcached или redis.',
+                id='api.W001',
+            ))
+    return warnings
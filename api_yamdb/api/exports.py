@@ -0,0 +1,60 @@
+import csv
+import json
+
+from .cache import categories, genres
+from .utils import batches
+from titles.models import Title
+
+EXPORT_CHUNK_SIZE = 2000
+TITLE_EXPORT_FIELDS = ('id', 'name', 'year', 'description',
+                       'category', 'genre', 'rating')
+
+
+class Echo:
+    """Буфер, возвращающий записанную строку вместо ее хранения."""
+
+    def write(self, value):
+        return value
+
+
+def iter_titles(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Лениво отдает произведения с жанрами, категорией и рейтингом.
+
+    Произведения читаются курсором на стороне сервера, id жанров
+    догружаются одним запросом на каждую пачку, а slug берутся из реестра.
+    """
+    rows = queryset.order_by('pk').values(
+        'id', 'name', 'year', 'description', 'category_id', 'rating'
+    ).iterator(chunk_size=chunk_size)
+    for chunk in batches(rows, chunk_size):
+        title_genres = {row['id']: [] for row in chunk}
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=title_genres
+        ).values_list('title_id', 'genre_id'):
+            genre = genres.representation(genre_id)
+            if genre is not None:
+                title_genres[title_id].append(genre['slug'])
+        for row in chunk:
+            category = categories.representation(row.pop('category_id'))
+            row['category'] = category and category['slug']
+            row['genre'] = sorted(title_genres[row['id']])
+            yield {field: row[field] for field in TITLE_EXPORT_FIELDS}
+
+
+def render_ndjson(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def render_csv(records):
+    writer = csv.writer(Echo())
+    yield writer.writerow(TITLE_EXPORT_FIELDS)
+    for record in records:
+        record['genre'] = ','.join(record['genre'])
+        yield writer.writerow(record.values())
+
+
+EXPORT_FORMATS = {
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
@@ -1,21 +1,100 @@
 import django_filters as df
+from rest_framework import filters
 
 from titles.models import Title
+from .cache import categories, genres
+from .search import SEARCH_RANK, get_search_backend
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+MATCH_CHOICES = (
+    (MATCH_ANY, 'Любой из жанров'),
+    (MATCH_ALL, 'Все жанры'),
+)
+
+
+def split_slugs(value):
+    """Уникальные slug из значения вида `a,b`."""
+    return list(dict.fromkeys(filter(None, (
+        slug.strip() for slug in value.split(',')
+    ))))
 
 
 class TitleFilter(df.FilterSet):
     """Фильтры произведений."""
 
-    name = df.CharFilter(field_name='name',
-                         lookup_expr='icontains',
-                         label='Название')
-    category = df.CharFilter(field_name='category__slug',
-                             lookup_expr='icontains',
-                             label='Категория')
-    genre = df.CharFilter(field_name='genre__slug',
-                          lookup_expr='icontains',
-                          label='Жанр')
+    search_fields = {
+        'name': ('name',),
+        'search': ('name', 'description'),
+    }
+
+    name = df.CharFilter(method='filter_search', label='Название')
+    search = df.CharFilter(method='filter_search',
+                           label='Поиск по названию и описанию')
+    category = df.CharFilter(method='filter_category',
+                             label='Категории через запятую')
+    genre = df.CharFilter(method='filter_genre',
+                          label='Жанры через запятую')
+    genre_match = df.ChoiceFilter(choices=MATCH_CHOICES,
+                                  method='filter_nothing',
+                                  label='Совпадение жанров')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'category', 'genre')
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value,
+                                           self.search_fields[name])
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(
+            category_id__in=categories.ids(split_slugs(value))
+        )
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтрует по id жанров в промежуточной таблице, без JOIN по slug.
+
+        С `genre_match=all` остаются произведения со всеми жанрами сразу.
+        """
+        slugs = split_slugs(value)
+        genre_ids = genres.ids(slugs)
+        title_genres = Title.genre.through.objects
+        if self.form.cleaned_data.get('genre_match') != MATCH_ALL:
+            return queryset.filter(pk__in=title_genres.filter(
+                genre_id__in=genre_ids
+            ).values('title_id'))
+        if len(genre_ids) < len(slugs):
+            return queryset.none()
+        for genre_id in genre_ids:
+            queryset = queryset.filter(pk__in=title_genres.filter(
+                genre_id=genre_id
+            ).values('title_id'))
+        return queryset
+
+    def filter_nothing(self, queryset, name, value):
+        """Параметр только меняет поведение других фильтров."""
+        return queryset
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """`?search=` по `search_fields` вьюсета через бэкенд поиска."""
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        search_fields = self.get_search_fields(view, request)
+        if not search_terms or not search_fields:
+            return queryset
+        return get_search_backend().search(
+            queryset, ' '.join(search_terms), search_fields
+        )
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """Без `?ordering=` сохраняет сортировку результатов поиска."""
+
+    def filter_queryset(self, request, queryset, view):
+        if (SEARCH_RANK in queryset.query.annotations
+                and not request.query_params.get(self.ordering_param)):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
@@ -0,0 +1,74 @@
+import io
+import timeit
+
+from django.core.management import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.management.commands.benchmark_renderers import PAGES
+from api.parsers import CBORParser, FastJSONParser, MessagePackParser
+from api.renderers import (CBORRenderer, FastJSONRenderer,
+                           MessagePackRenderer, cbor2, msgpack)
+
+FORMATS = {
+    'JSON': (JSONRenderer, JSONParser, True),
+    'FastJSON': (FastJSONRenderer, FastJSONParser, True),
+    'MessagePack': (MessagePackRenderer, MessagePackParser,
+                    msgpack is not None),
+    'CBOR': (CBORRenderer, CBORParser, cbor2 is not None),
+}
+
+
+class Command(BaseCommand):
+    """Класс команды для сравнения размера и скорости форматов ответа."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Размеры страниц.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Количество кодирований и разборов каждой страницы.'
+        )
+
+    def handle(self, *args, **kwargs):
+        formats = {}
+        for name, (renderer_class, parser_class, available) in (
+            FORMATS.items()
+        ):
+            if available:
+                formats[name] = (renderer_class(), parser_class())
+            else:
+                print(f'{name}: пакет не установлен, формат пропущен.')
+        repeat = kwargs['repeat']
+        for page_name, make_item in PAGES.items():
+            for page_size in kwargs['page_sizes']:
+                page = {
+                    'count': page_size,
+                    'next': None,
+                    'previous': None,
+                    'results': [make_item(number)
+                                for number in range(page_size)],
+                }
+                for name, (renderer, parser) in formats.items():
+                    payload = renderer.render(page)
+                    if parser.parse(io.BytesIO(payload)) != page:
+                        print(f'{page_name}, {page_size}, {name}: разбор '
+                              f'не совпадает с исходной страницей!')
+                    encode = repeat / timeit.timeit(
+                        lambda: renderer.render(page), number=repeat
+                    )
+                    decode = repeat / timeit.timeit(
+                        lambda: parser.parse(io.BytesIO(payload)),
+                        number=repeat
+                    )
+                    print(f'{page_name}, {page_size} на странице, {name}: '
+                          f'{len(payload)} байт, '
+                          f'кодирование {encode:.0f} стр/с, '
+                          f'разбор {decode:.0f} стр/с')
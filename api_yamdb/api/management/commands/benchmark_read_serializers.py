@@ -0,0 +1,83 @@
+import timeit
+
+from django.core.management import BaseCommand
+from django.db.models import Prefetch
+
+from api.read_serializers import (CommentReadSerializer, ReviewReadSerializer,
+                                  TitleReadSerializer)
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleSerializer)
+from reviews.models import Comment, Review
+from titles.models import Genre, Title
+
+ENDPOINTS = {
+    'titles': (
+        Title.objects.prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.only('pk').order_by())
+        ).order_by('name', 'id'),
+        TitleSerializer,
+        TitleReadSerializer,
+    ),
+    'reviews': (
+        Review.objects.select_related('author').order_by('-pub_date', 'id'),
+        ReviewSerializer,
+        ReviewReadSerializer,
+    ),
+    'comments': (
+        Comment.objects.select_related('author').order_by('-pub_date', 'id'),
+        CommentSerializer,
+        CommentReadSerializer,
+    ),
+}
+
+
+class Command(BaseCommand):
+    """Класс команды для сравнения сериализаторов списков на данных базы."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Размеры страниц.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество сериализаций каждой страницы.'
+        )
+
+    def handle(self, *args, **kwargs):
+        for name, (queryset, serializer_class,
+                   read_serializer_class) in ENDPOINTS.items():
+            for page_size in kwargs['page_sizes']:
+                page = queryset[:page_size]
+                rows = len(page)
+                if not rows:
+                    print(f'{name}: в базе нет данных')
+                    break
+                serialize = {
+                    'DRF': lambda: serializer_class(
+                        page.all(), many=True
+                    ).data,
+                    'values': lambda: read_serializer_class(
+                        page.all(), many=True
+                    ).data,
+                }
+                if serialize['DRF']() != serialize['values']():
+                    print(f'{name}, {rows}: вывод сериализаторов '
+                          f'отличается!')
+                speeds = {
+                    kind: kwargs['repeat'] / timeit.timeit(
+                        function, number=kwargs['repeat']
+                    )
+                    for kind, function in serialize.items()
+                }
+                print(f'{name}, {rows} на странице: '
+                      f'DRF {speeds["DRF"]:.0f} стр/с, '
+                      f'values {speeds["values"]:.0f} стр/с, '
+                      f'ускорение {speeds["values"] / speeds["DRF"]:.1f}x')
+                if rows < page_size:
+                    break
@@ -0,0 +1,91 @@
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+
+
+def title_item(number):
+    """Элемент страницы в формате TitleSerializer."""
+    return {
+        'id': number,
+        'name': f'Произведение номер {number}',
+        'year': 1900 + number % 120,
+        'rating': number % 10 + 1 / 3,
+        'description': 'Описание произведения. ' * 5,
+        'genre': [{'name': 'Драма', 'slug': 'drama'},
+                  {'name': 'Комедия', 'slug': 'comedy'}],
+        'category': {'name': 'Фильм', 'slug': 'films'},
+    }
+
+
+def review_item(number):
+    """Элемент страницы в формате ReviewSerializer."""
+    pub_date = datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(
+        minutes=number
+    )
+    return {
+        'id': number,
+        'author': f'user{number % 50}',
+        'text': 'Текст отзыва с мнением о произведении. ' * 4,
+        'score': number % 10 + 1,
+        'pub_date': pub_date.isoformat().replace('+00:00', 'Z'),
+        'title': number % 100,
+    }
+
+
+PAGES = {
+    'titles': title_item,
+    'reviews': review_item,
+}
+
+
+class Command(BaseCommand):
+    """Класс команды для сравнения скорости JSON-рендереров."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Размеры страниц.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Количество рендеров каждой страницы.'
+        )
+
+    def handle(self, *args, **kwargs):
+        if orjson is None:
+            print('orjson не установлен, FastJSONRenderer работает '
+                  'через stdlib.')
+        renderers = (JSONRenderer(), FastJSONRenderer())
+        for name, make_item in PAGES.items():
+            for page_size in kwargs['page_sizes']:
+                page = {
+                    'count': page_size,
+                    'next': None,
+                    'previous': None,
+                    'results': [make_item(number)
+                                for number in range(page_size)],
+                }
+                outputs = [renderer.render(page) for renderer in renderers]
+                if outputs[0] != outputs[1]:
+                    print(f'{name}, {page_size}: вывод рендереров '
+                          f'отличается!')
+                speeds = [
+                    kwargs['repeat'] / timeit.timeit(
+                        lambda: renderer.render(page),
+                        number=kwargs['repeat']
+                    )
+                    for renderer in renderers
+                ]
+                print(f'{name}, {page_size} на странице: '
+                      f'JSONRenderer {speeds[0]:.0f} стр/с, '
+                      f'FastJSONRenderer {speeds[1]:.0f} стр/с, '
+                      f'ускорение {speeds[1] / speeds[0]:.1f}x')
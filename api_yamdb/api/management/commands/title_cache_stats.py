@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from api.cache import title_cache
+
+
+class Command(BaseCommand):
+    """Класс команды для вывода счетчиков кеша произведений."""
+
+    def handle(self, *args, **kwargs):
+        stats = title_cache.stats()
+        print(f'Попаданий: {stats["hits"]}, промахов: {stats["misses"]}')
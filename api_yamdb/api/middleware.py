@@ -0,0 +1,177 @@
+import gzip
+import re
+import zlib
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .cache import list_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+Q_RE = re.compile(r'q\s*=\s*([0-9.]+)')
+
+
+class Codec(ABC):
+    """Кодировка Content-Encoding: сжатие тела целиком и потоком."""
+
+    encoding = None
+    level = None
+    available = True
+
+    @abstractmethod
+    def compress(self, data):
+        """Тело ответа целиком в сжатом виде."""
+
+    @abstractmethod
+    def compressor(self):
+        """Пара функций: сжать очередной кусок и завершить поток."""
+
+    def stream(self, chunks):
+        compress, flush = self.compressor()
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield flush()
+
+
+class GzipCodec(Codec):
+    encoding = 'gzip'
+    level = 6
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compressor(self):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED,
+                                      zlib.MAX_WBITS | 16)
+        return compressor.compress, compressor.flush
+
+
+class BrotliCodec(Codec):
+    encoding = 'br'
+    level = 5
+    available = brotli is not None
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def compressor(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return compressor.process, compressor.finish
+
+
+class ZstdCodec(Codec):
+    encoding = 'zstd'
+    level = 3
+    available = zstandard is not None
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressor(self):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return compressor.compress, compressor.flush
+
+
+CODECS = {codec.encoding: codec
+          for codec in (BrotliCodec(), ZstdCodec(), GzipCodec())
+          if codec.available}
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding с их весами q."""
+    encodings = {}
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        match = Q_RE.search(params)
+        try:
+            encodings[name] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            encodings[name] = 0.0
+    return encodings
+
+
+def choose_codec(header):
+    """Кодек с наибольшим q, при равенстве — по COMPRESSION_ENCODINGS."""
+    accepted = accepted_encodings(header)
+    candidates = []
+    for index, encoding in enumerate(settings.COMPRESSION_ENCODINGS):
+        weight = accepted.get(encoding, accepted.get('*', 0.0))
+        if encoding in CODECS and weight > 0:
+            candidates.append((-weight, index, encoding))
+    if not candidates:
+        return None
+    return CODECS[min(candidates)[2]]
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает ответы типов COMPRESSION_CONTENT_TYPES.
+
+    Ответы меньше COMPRESSION_MIN_SIZE байт не сжимаются, потоковые
+    сжимаются по мере отдачи. Сжатое тело ответа из кеша списков
+    кешируется рядом с ним и не пересжимается при повторных запросах.
+    """
+
+    def process_response(self, request, response):
+        if (response.has_header('Content-Encoding')
+                or not self.compressible(response)):
+            return response
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codec = choose_codec(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codec is None:
+            return response
+        if response.streaming:
+            response.streaming_content = codec.stream(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = self.compress(codec, response)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        # Как GZipMiddleware: сжатое тело побайтно отличается от исходного.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = codec.encoding
+        return response
+
+    @staticmethod
+    def compressible(response):
+        content_type = response.get('Content-Type', '')
+        return (content_type.split(';')[0].strip().lower()
+                in settings.COMPRESSION_CONTENT_TYPES)
+
+    @staticmethod
+    def compress(codec, response):
+        key = getattr(response, 'list_cache_key', None)
+        if key is None:
+            return codec.compress(response.content)
+        key = list_cache.body_key(key, response.accepted_media_type,
+                                  codec.encoding)
+        body = list_cache.get(key)
+        if body is None:
+            body = codec.compress(response.content)
+            list_cache.set(key, body)
+        return body
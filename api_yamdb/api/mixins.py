@@ -1,15 +1,327 @@
-from rest_framework import filters, mixins, viewsets
+from abc import ABC, abstractmethod
+from http import HTTPStatus
 
+from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .cache import list_cache
+from .filters import IndexedSearchFilter
 from .permissions import ReadOnly, IsAdmin
 
 
-class CreateListDestroyViewSet(mixins.CreateModelMixin,
+class GenerationMixin:
+    """Состояние ответа по параметрам запроса и поколениям моделей.
+
+    Поколения берутся из моделей `cache_models`, а параметры запроса из
+    фильтров, поиска, сортировки и пагинации вьюсета.
+    """
+
+    cache_models = ()
+
+    def get_cache_scopes(self):
+        return [(model, None)
+                for model in self.cache_models or (self.queryset.model,)]
+
+    def get_cache_params(self):
+        params = {
+            getattr(backend, name)
+            for backend in self.filter_backends
+            for name in ('search_param', 'ordering_param')
+            if hasattr(backend, name)
+        }
+        filterset_class = getattr(self, 'filterset_class', None)
+        if filterset_class is not None:
+            params.update(filterset_class.base_filters)
+        params.update(
+            getattr(self, name) for name in
+            ('fields_query_param', 'exclude_query_param')
+            if hasattr(self, name)
+        )
+        paginator = self.paginator
+        if paginator is not None:
+            params.update(
+                getattr(paginator, name) for name in
+                ('page_query_param', 'page_size_query_param',
+                 'cursor_query_param', 'mode_query_param')
+                if getattr(paginator, name, None)
+            )
+        return params
+
+    def get_cache_state(self):
+        """Хеш и время изменения ответа, считаются один раз за запрос."""
+        if getattr(self, '_cache_state', None) is None:
+            self._cache_state = list_cache.state(self, self.request)
+        return self._cache_state
+
+
+class NotModified(Exception):
+    """Прерывает обработку запроса готовым ответом 304 или 412."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin(GenerationMixin):
+    """ETag и Last-Modified для list и retrieve.
+
+    Условный запрос проверяется после прав доступа и проверки
+    родителя вложенного маршрута, но до выборки и сериализации.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+    conditional_headers = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional = (request.method in ('GET', 'HEAD')
+                            and self.action in self.conditional_actions)
+        if not self.conditional:
+            return
+        # 304 нельзя отдавать для ресурса, родителя которого уже нет.
+        if hasattr(self, 'check_parent') and any(
+            header in request.META for header in self.conditional_headers
+        ):
+            self.check_parent()
+        response = get_conditional_response(
+            request, etag=self.get_etag(),
+            last_modified=self.get_cache_state()[1]
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response,
+                                             *args, **kwargs)
+        if (getattr(self, 'conditional', False)
+                and response.status_code in (HTTPStatus.OK,
+                                             HTTPStatus.NOT_MODIFIED)):
+            response['ETag'] = self.get_etag()
+            response['Last-Modified'] = http_date(self.get_cache_state()[1])
+        return response
+
+    def get_etag(self):
+        # Представления в JSON и бинарных форматах различаются побайтно.
+        return quote_etag(f'{self.get_cache_state()[0]}-'
+                          f'{self.request.accepted_renderer.format}')
+
+
+class NestedParentMixin(ABC):
+    """Проверка родителя вложенного маршрута не чаще раза за запрос.
+
+    Выборка детей сама фильтруется по ключу родителя, поэтому
+    отдельный запрос exists() нужен только при создании и для пустой
+    страницы списка.
+    """
+
+    @abstractmethod
+    def get_parent_queryset(self):
+        """Выборка родителя из параметров маршрута."""
+
+    def check_parent(self):
+        if getattr(self, '_parent_exists', None) is None:
+            self._parent_exists = self.get_parent_queryset().exists()
+        if not self._parent_exists:
+            raise Http404
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.check_parent()
+        return page
+
+    def create(self, request, *args, **kwargs):
+        self.check_parent()
+        return super().create(request, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """`?fields=` и `?exclude=` для GET: только нужные поля в ответе.
+
+    Лишние поля убираются из сериализатора, а выборка ограничивается
+    через .only() столбцами оставшихся полей и ключа сортировки.
+    """
+
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def get_available_fields(self):
+        return list(self.get_serializer_class()().fields)
+
+    def get_sparse_fields(self):
+        """Поля ответа в порядке сериализатора или None, если нужны все."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        query_params = self.request.query_params
+        if self.request.method not in ('GET', 'HEAD') or not (
+            query_params.get(self.fields_query_param)
+            or query_params.get(self.exclude_query_param)
+        ):
+            return None
+        available = self.get_available_fields()
+        requested = {}
+        for param in (self.fields_query_param, self.exclude_query_param):
+            requested[param] = {
+                name.strip()
+                for value in query_params.getlist(param)
+                for name in value.split(',') if name.strip()
+            }
+            unknown = requested[param].difference(available)
+            if unknown:
+                raise ValidationError({param: [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+                ]})
+        fields = requested[self.fields_query_param] or set(available)
+        return [name for name in available if name in fields
+                and name not in requested[self.exclude_query_param]]
+
+    def trim_fields(self, data):
+        """Оставляет запрошенные поля в готовом ответе, например из кеша."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return data
+        return {name: data[name] for name in fields}
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            serializer_fields = getattr(serializer, 'child', serializer).fields
+            for name in list(serializer_fields):
+                if name not in fields:
+                    serializer_fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None or queryset.query.select_related:
+            return queryset
+        return self.narrow_queryset(queryset, fields)
+
+    def narrow_queryset(self, queryset, fields):
+        """Ограничивает выборку столбцами полей, если они все известны."""
+        meta = queryset.model._meta
+        columns = {meta.pk.name}
+        columns.update(name.lstrip('-') for name in
+                       getattr(self, 'keyset_ordering', None) or ())
+        to_many = False
+        serializer_fields = self.get_serializer_class()().fields
+        for name in fields:
+            try:
+                model_field = meta.get_field(serializer_fields[name].source)
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.many_to_many or model_field.one_to_many:
+                to_many = True
+            elif model_field.concrete:
+                columns.add(model_field.name)
+        if not to_many:
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*columns)
+
+
+class ValuesReadMixin(SparseFieldsMixin):
+    """list и retrieve строятся из строк .values() `read_serializer_class`.
+
+    Запись и ответы на нее по-прежнему идут через обычный сериализатор.
+    С `?fields=` в .values() попадают только столбцы запрошенных полей.
+    """
+
+    read_serializer_class = None
+    read_actions = ('list', 'retrieve')
+
+    def use_read_serializer(self):
+        # Формы Browsable API запрашивают сериализатор с методом POST.
+        return (self.read_serializer_class is not None
+                and self.action in self.read_actions
+                and self.request.method in ('GET', 'HEAD'))
+
+    def get_available_fields(self):
+        if self.use_read_serializer():
+            return list(self.read_serializer_class.field_values)
+        return super().get_available_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        if not self.use_read_serializer():
+            return super().get_serializer(*args, **kwargs)
+        kwargs.setdefault('context', self.get_serializer_context())
+        kwargs.setdefault('fields', self.get_sparse_fields())
+        return self.read_serializer_class(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        if not self.use_read_serializer():
+            return super().filter_queryset(queryset)
+        return super(SparseFieldsMixin, self).filter_queryset(queryset)
+
+    def read_queryset(self, queryset):
+        return self.read_serializer_class.read_queryset(
+            queryset, self.get_sparse_fields(),
+            extra=[name.lstrip('-') for name in
+                   getattr(self, 'keyset_ordering', None) or ()]
+        )
+
+    def paginate_queryset(self, queryset):
+        if self.use_read_serializer():
+            queryset = self.read_queryset(queryset)
+        return super().paginate_queryset(queryset)
+
+    def get_object(self):
+        if not self.use_read_serializer():
+            return super().get_object()
+        queryset = self.read_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, row)
+        return row
+
+
+class CachedListMixin(GenerationMixin):
+    """Отдает повторные запросы списка из кеша ответов."""
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache.key(self, self.get_cache_state()[0])
+        data = list_cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            list_cache.set(key, response.data)
+        else:
+            response = Response(data)
+        # По ключу CompressionMiddleware кеширует сжатое тело. HTML
+        # Browsable API зависит от пользователя, поэтому не кешируется.
+        if request.accepted_renderer.format != 'api':
+            response.list_cache_key = key
+        return response
+
+
+class CreateListDestroyViewSet(ConditionalGetMixin,
+                               CachedListMixin,
+                               SparseFieldsMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     """Вьсет для get, post, delete запросов."""
 
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (IndexedSearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
     permission_classes = (ReadOnly | IsAdmin,)
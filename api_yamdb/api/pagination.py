@@ -0,0 +1,157 @@
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с опциональным курсорным режимом.
+
+    Курсорный режим включается параметром `?pagination=cursor`, наличием
+    `?cursor=` в запросе или атрибутом вьюсета `keyset_pagination = True`.
+    Страница выбирается условием по ключу `keyset_ordering` вьюсета вместо
+    OFFSET, а COUNT(*) не выполняется, поэтому время ответа не зависит
+    от глубины страницы.
+    """
+
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request, view)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.ordering = view.keyset_ordering
+        self.keyset_page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(map(self.invert_field, ordering))
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, values))
+        page = list(queryset[:self.keyset_page_size + 1])
+        has_more = len(page) > self.keyset_page_size
+        page = page[:self.keyset_page_size]
+        if reverse:
+            page.reverse()
+        self.next_values = self.previous_values = None
+        if page and (has_more or reverse):
+            self.next_values = self.get_values(page[-1])
+        if page and (values is not None and not reverse
+                     or reverse and has_more):
+            self.previous_values = self.get_values(page[0])
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        return self.encode_cursor(self.next_values, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return self.encode_cursor(self.previous_values, reverse=True)
+
+    def use_keyset(self, request, view):
+        if not getattr(view, 'keyset_ordering', None):
+            return False
+        return (
+            getattr(view, 'keyset_pagination', False)
+            or self.cursor_query_param in request.query_params
+            or request.query_params.get(
+                self.mode_query_param
+            ) == self.cursor_mode
+        )
+
+    @staticmethod
+    def invert_field(field):
+        if field.startswith('-'):
+            return field[1:]
+        return f'-{field}'
+
+    @staticmethod
+    def keyset_filter(ordering, values):
+        """Условие «строка после ключа» для составной сортировки."""
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                ordered.lstrip('-'): value
+                for ordered, value in zip(ordering[:index], values)
+            }
+            conditions.append(
+                Q(**equal, **{f'{name}__{lookup}': values[index]})
+            )
+        return reduce(or_, conditions)
+
+    def get_values(self, instance):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request, model):
+        """Значения ключа из курсора, приведенные к типам полей модели."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii'))
+            )
+            values, reverse = cursor['v'], bool(cursor.get('r'))
+            if (not isinstance(values, list)
+                    or len(values) != len(self.ordering)
+                    or None in values):
+                raise ValueError
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError,
+                ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        if values is None:
+            return None
+        cursor = {'v': values}
+        if reverse:
+            cursor['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor).encode('utf-8')
+        ).decode('ascii')
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
@@ -0,0 +1,87 @@
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import (CBORRenderer, FastJSONRenderer, MessagePackRenderer,
+                        cbor2, msgpack, orjson, require)
+
+
+def loads(data):
+    """orjson.loads, если он установлен, иначе json.loads."""
+    if orjson is None:
+        return json.loads(data, parse_constant=json.strict_constant)
+    return orjson.loads(data)
+
+
+def is_utf8(encoding):
+    return codecs.lookup(encoding).name == 'utf-8'
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson для тел в UTF-8."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or not is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class NDJSONParser(BaseParser):
+    """Разбирает NDJSON в список объектов, по одному на строку."""
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if stream is None:
+            return []
+        items, number = [], 0
+        try:
+            for number, line in enumerate(
+                codecs.getreader(encoding)(stream), 1
+            ):
+                if line.strip():
+                    items.append(loads(line))
+        except ValueError as error:
+            raise ParseError(f'Ошибка разбора NDJSON в строке {number}: '
+                             f'{error}')
+        return items
+
+
+class MessagePackParser(BaseParser):
+    """Разбирает тело в MessagePack, нужен пакет msgpack."""
+
+    media_type = MessagePackRenderer.media_type
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        unpackb = require(msgpack, 'msgpack').unpackb
+        try:
+            return unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as error:
+            raise ParseError(f'Ошибка разбора MessagePack: {error}')
+
+
+class CBORParser(BaseParser):
+    """Разбирает тело в CBOR, нужен пакет cbor2."""
+
+    media_type = CBORRenderer.media_type
+    renderer_class = CBORRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        loads = require(cbor2, 'cbor2').loads
+        try:
+            return loads(stream.read())
+        except (ValueError, cbor2.CBORDecodeError) as error:
+            raise ParseError(f'Ошибка разбора CBOR: {error}')
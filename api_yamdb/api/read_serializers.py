@@ -0,0 +1,130 @@
+from operator import itemgetter
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from .cache import categories, genres
+from titles.models import GenreTitle
+
+
+class ValuesSerializer:
+    """Сериализатор только для чтения, строящий ответ из строк .values().
+
+    Наследник задает `field_values`: поле ответа и столбец .values(),
+    из которого оно берется. Значение столбца можно преобразовать
+    методом `represent_<поле>(value)`. `prepare(rows)` может догрузить
+    данные для всей страницы разом. `fields` оставляет в ответе и в
+    запросе только часть полей.
+    """
+
+    field_values = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.values = cls.columns()
+
+    def __init__(self, instance=None, many=False, context=None, fields=None,
+                 **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        self.fields = tuple(
+            name for name in self.field_values
+            if fields is None or name in fields
+        )
+        self.getters = [(name, self.getter(name)) for name in self.fields]
+
+    @classmethod
+    def columns(cls, fields=None):
+        return tuple(dict.fromkeys(
+            column for name, column in cls.field_values.items()
+            if fields is None or name in fields
+        ))
+
+    @classmethod
+    def read_queryset(cls, queryset, fields=None, extra=()):
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys(cls.columns(fields) + tuple(extra))
+        )
+
+    def getter(self, name):
+        get_value = itemgetter(self.field_values[name])
+        represent = getattr(self, f'represent_{name}', None)
+        if represent is None:
+            return get_value
+        return lambda row: represent(get_value(row))
+
+    def prepare(self, rows):
+        pass
+
+    def to_representation(self, row):
+        return {name: get(row) for name, get in self.getters}
+
+    @property
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet):
+            rows = self.read_queryset(rows, self.fields)
+        rows = list(rows) if self.many else [rows]
+        self.prepare(rows)
+        data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
+
+
+class TitleReadSerializer(ValuesSerializer):
+    """Вывод TitleSerializer, жанры и категория берутся из реестра."""
+
+    field_values = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'rating': 'rating',
+        'description': 'description',
+        'genre': 'id',
+        'category': 'category_id',
+    }
+
+    def prepare(self, rows):
+        if 'genre' not in self.fields:
+            return
+        self.genre_ids = {row['id']: [] for row in rows}
+        for title_id, genre_id in GenreTitle.objects.filter(
+            title_id__in=self.genre_ids
+        ).values_list('title_id', 'genre_id'):
+            self.genre_ids[title_id].append(genre_id)
+
+    def represent_rating(self, rating):
+        return None if rating is None else int(rating)
+
+    def represent_genre(self, title_id):
+        return genres.representations(self.genre_ids[title_id])
+
+    def represent_category(self, category_id):
+        return categories.representation(category_id)
+
+
+class ReviewReadSerializer(ValuesSerializer):
+    """Вывод ReviewSerializer."""
+
+    field_values = {
+        'id': 'id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'score': 'score',
+        'title': 'title_id',
+    }
+    represent_pub_date = serializers.DateTimeField().to_representation
+
+
+class CommentReadSerializer(ValuesSerializer):
+    """Вывод CommentSerializer."""
+
+    field_values = {
+        'id': 'id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'review': 'review_id',
+    }
+    represent_pub_date = serializers.DateTimeField().to_representation
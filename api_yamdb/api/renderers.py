@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+# Даты отдаются кодировщику DRF, чтобы формат совпадал с JSONRenderer.
+ORJSON_OPTIONS = orjson and (orjson.OPT_NON_STR_KEYS
+                             | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson с тем же компактным выводом.
+
+    Типы, которых orjson не знает, передаются кодировщику DRF. Без orjson,
+    а также для вывода с отступами работает обычный JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Например, целые больше 64 бит.
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # Как JSONRenderer, экранирует U+2028 и U+2029.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
+
+
+def require(module, package):
+    """Модуль необязательной зависимости или ошибка настройки."""
+    if module is None:
+        raise ImproperlyConfigured(f'Пакет {package} не установлен.')
+    return module
+
+
+class BinaryRenderer(BaseRenderer, ABC):
+    """Основа рендереров бинарных форматов.
+
+    Значения, которых формат не знает (Decimal, ленивые строки и т. п.),
+    переводятся кодировщиком DRF, как в JSON.
+    """
+
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.dumps(data)
+
+    @abstractmethod
+    def dumps(self, data):
+        """Данные ответа в байтах формата."""
+
+
+class MessagePackRenderer(BinaryRenderer):
+    """Ответ в MessagePack, нужен пакет msgpack."""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+
+    def dumps(self, data):
+        return require(msgpack, 'msgpack').packb(
+            data, default=self.encoder_class().default
+        )
+
+
+class CBORRenderer(BinaryRenderer):
+    """Ответ в CBOR, нужен пакет cbor2."""
+
+    media_type = 'application/cbor'
+    format = 'cbor'
+
+    def dumps(self, data):
+        default = self.encoder_class().default
+        return require(cbor2, 'cbor2').dumps(
+            data, default=lambda encoder, value: encoder.encode(
+                default(value)
+            )
+        )
@@ -0,0 +1,101 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import (CharField, FloatField, Func, Lookup, Q,
+                              TextField, Value)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+SEARCH_RANK = 'search_rank'
+WORD_RE = re.compile(r'\w+')
+
+
+class TrigramWordSimilar(Lookup):
+    """Оператор pg_trgm `%>`, который обслуживается GIN-индексом."""
+
+    lookup_name = 'trigram_word_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} %%> {rhs}', lhs_params + rhs_params
+
+
+CharField.register_lookup(TrigramWordSimilar)
+TextField.register_lookup(TrigramWordSimilar)
+
+
+class WordSimilarity(Func):
+    function = 'word_similarity'
+    output_field = FloatField()
+
+
+class ContainsSearchBackend:
+    """Поиск подстроки без индекса, для баз без полнотекстового поиска."""
+
+    def search(self, queryset, query, fields):
+        return queryset.filter(reduce(or_, (
+            Q(**{f'{field}__icontains': query}) for field in fields
+        )))
+
+
+class TrigramSearchBackend(ContainsSearchBackend):
+    """Поиск по GIN-индексам pg_trgm с сортировкой по похожести."""
+
+    def search(self, queryset, query, fields):
+        similarities = [WordSimilarity(Value(query), field)
+                        for field in fields]
+        rank = (Greatest(*similarities) if len(similarities) > 1
+                else similarities[0])
+        return queryset.filter(reduce(or_, (
+            Q(**{f'{field}__trigram_word_similar': query})
+            for field in fields
+        ))).annotate(**{SEARCH_RANK: rank}).order_by(f'-{SEARCH_RANK}', 'pk')
+
+
+class FullTextSearchBackend(ContainsSearchBackend):
+    """Поиск по таблицам FTS5 `<таблица>_fts`, которые ведут триггеры.
+
+    Каждое слово запроса ищется как префикс, результаты сортируются
+    по bm25.
+    """
+
+    def search(self, queryset, query, fields):
+        words = WORD_RE.findall(query)
+        if not words:
+            return super().search(queryset, query, fields)
+        match = '{%s} : (%s)' % (
+            ' '.join(fields),
+            ' AND '.join(f'"{word}"*' for word in words)
+        )
+        meta = queryset.model._meta
+        fts_table = f'{meta.db_table}_fts'
+        rank = RawSQL(
+            f'SELECT bm25({fts_table}) FROM {fts_table} '
+            f'WHERE {fts_table} MATCH %s '
+            f'AND {fts_table}.rowid = {meta.db_table}.{meta.pk.column}',
+            (match,),
+            output_field=FloatField()
+        )
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s',
+            (match,)
+        )).annotate(**{SEARCH_RANK: rank}).order_by(SEARCH_RANK, 'pk')
+
+
+SEARCH_BACKENDS = {
+    'postgresql': TrigramSearchBackend,
+    'sqlite': FullTextSearchBackend,
+}
+
+
+def get_search_backend():
+    """Бэкенд из настройки SEARCH_BACKEND или по типу базы данных."""
+    backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    return SEARCH_BACKENDS.get(connection.vendor, ContainsSearchBackend)()
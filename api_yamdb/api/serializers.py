@@ -1,8 +1,10 @@
 from django.core.validators import MaxValueValidator
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.validators import UniqueTogetherValidator
 
+from .cache import categories, genres
 from .consts import NAME_LENGTH, USERNAME_SLUG_SHOW_LENGTH, EMAIL_LENGTH
 from .validators import username_validator, get_current_year
 from titles.models import Title, Category, Genre
@@ -26,11 +28,106 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class TaxonomyField(serializers.Field):
+    """Категория или жанры произведения из реестра, без запросов к базе.
+
+    Берет id из внешнего ключа или предзагруженных жанров и отдает то же,
+    что CategorySerializer и GenreSerializer, с жанрами по названию.
+    """
+
+    def __init__(self, registry, many=False, **kwargs):
+        self.registry = registry
+        self.many = many
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if not self.many:
+            return getattr(instance, f'{self.source}_id')
+        related = getattr(instance, self.source)
+        if self.source in getattr(instance, '_prefetched_objects_cache', {}):
+            return [obj.pk for obj in related.all()]
+        return list(related.order_by().values_list('pk', flat=True))
+
+    def to_representation(self, value):
+        if not self.many:
+            return self.registry.representation(value)
+        return self.registry.representations(value)
+
+
+class TaxonomySlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug, которое проверяется по реестру без запроса к базе."""
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        kwargs.setdefault('queryset', registry.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        list_kwargs.update(
+            (key, value) for key, value in kwargs.items()
+            if key in MANY_RELATION_KWARGS
+        )
+        return TaxonomySlugsField(**list_kwargs)
+
+    def resolve(self, slugs):
+        """Словарь slug→объект или None.
+
+        Сначала смотрит общий для пачки словарь `resolved_slugs`
+        из контекста, остальное ищет в реестре.
+        """
+        resolved = self.context.get('resolved_slugs', {}).get(
+            self.registry.model, {}
+        )
+        found = {slug: resolved[slug] for slug in slugs if slug in resolved}
+        missing = [slug for slug in slugs if slug not in resolved]
+        if missing:
+            found.update(self.registry.instances(missing))
+        return found
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        instance = self.resolve([data])[data]
+        if instance is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return instance
+
+
+class TaxonomySlugsField(serializers.ManyRelatedField):
+    """Список slug, проверяемый целиком за один проход по реестру.
+
+    В ошибке перечисляются все неизвестные slug сразу.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        for slug in data:
+            if not isinstance(slug, str):
+                self.child_relation.fail('invalid')
+        slugs = list(dict.fromkeys(data))
+        found = self.child_relation.resolve(slugs)
+        unknown = [slug for slug in slugs if found[slug] is None]
+        if unknown:
+            model = self.child_relation.registry.model
+            raise ValidationError(
+                f'{model._meta.verbose_name_plural} не найдены: '
+                f'{", ".join(unknown)}.'
+            )
+        return [found[slug] for slug in slugs]
+
+
 class TitleSerializer(serializers.ModelSerializer):
     """Сериализатор произведений для безопасных методов."""
 
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(many=True, read_only=True)
+    category = TaxonomyField(categories)
+    genre = TaxonomyField(genres, many=True)
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -49,15 +146,8 @@ class TitleSerializer(serializers.ModelSerializer):
 class TitleCreateSerializer(serializers.ModelSerializer):
     """Сериализатор произведений для небезопасных методов."""
 
-    category = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Category.objects.all()
-    )
-    genre = serializers.SlugRelatedField(
-        many=True,
-        slug_field='slug',
-        queryset=Genre.objects.all()
-    )
+    category = TaxonomySlugRelatedField(categories)
+    genre = TaxonomySlugRelatedField(genres, many=True)
     year = serializers.IntegerField(
         validators=(MaxValueValidator(get_current_year),)
     )
@@ -65,6 +155,7 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = '__all__'
+        read_only_fields = ('reviews_count', 'scores_sum', 'rating')
 
     def validate_genre(self, genre):
         if not genre:
@@ -72,8 +163,21 @@ class TitleCreateSerializer(serializers.ModelSerializer):
                                               'жанры обязательны!')
         return genre
 
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = super().create(validated_data)
+        title.add_genres(genre.pk for genre in genres)
+        return title
+
+    def update(self, title, validated_data):
+        genres = validated_data.pop('genre', None)
+        title = super().update(title, validated_data)
+        if genres is not None:
+            title.set_genres(genre.pk for genre in genres)
+        return title
+
     def to_representation(self, title):
-        return TitleSerializer(title).data
+        return TitleSerializer(title, context=self.context).data
 
 
 class UserSerializer(serializers.ModelSerializer):
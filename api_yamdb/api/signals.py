@@ -0,0 +1,110 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .cache import TAXONOMY_REGISTRIES, list_cache, title_cache
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+
+def on_commit(func, *args, **kwargs):
+    """Сбрасывает кеш после фиксации транзакции, а не до нее.
+
+    Иначе параллельный запрос успеет положить в кеш еще старые данные,
+    а откат транзакции все равно сбросит кеш.
+    """
+    transaction.on_commit(partial(func, *args, **kwargs))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    on_commit(title_cache.invalidate, (instance.pk,))
+    on_commit(list_cache.bump, Title)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    """Отзывы удаленного произведения пропали, даже если их не было."""
+    on_commit(list_cache.bump, Review, scope=instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        on_commit(list_cache.bump, Title)
+    if action in ('post_add', 'post_remove'):
+        on_commit(title_cache.invalidate,
+                  list(pk_set) if reverse else (instance.pk,))
+    elif action == 'pre_clear':
+        on_commit(title_cache.invalidate, (
+            list(instance.title.values_list('pk', flat=True)) if reverse
+            else (instance.pk,)
+        ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def category_or_genre_changed(sender, instance, **kwargs):
+    """Сбрасывает произведения, в которых показаны категория или жанр."""
+    on_commit(title_cache.invalidate,
+              list(instance.title.values_list('pk', flat=True)))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_list_generation(sender, **kwargs):
+    on_commit(list_cache.bump, sender)
+    on_commit(TAXONOMY_REGISTRIES[sender].invalidate)
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def remember_review_titles(sender, instance, **kwargs):
+    """Запоминает прежнее произведение отзыва.
+
+    Сигнал рейтинга в reviews сбрасывает loaded_title_id при сохранении,
+    поэтому прежнее значение берется до него.
+    """
+    instance.changed_title_ids = {
+        instance.title_id, instance.loaded_title_id
+    } - {None}
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Сбрасывает произведения, рейтинг которых изменил отзыв."""
+    title_ids = instance.changed_title_ids
+    on_commit(title_cache.invalidate, title_ids)
+    on_commit(list_cache.bump, Review)
+    for title_id in title_ids:
+        on_commit(list_cache.bump, Review, scope=title_id)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    on_commit(list_cache.bump, Comment, scope=instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    on_commit(list_cache.bump, Comment)
+    on_commit(list_cache.bump, Comment, scope=instance.review_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Имя пользователя показывается автором отзывов и комментариев."""
+    on_commit(list_cache.bump, User)
@@ -1,14 +1,23 @@
-from django.conf import settings
-from django.core.mail import send_mail
+from itertools import islice
+
+from users.outbox import enqueue
 
 
 def send_letter(email, confirmation_code):
-    """Отправка письма с кодом подтверждения."""
+    """Постановка письма с кодом подтверждения в очередь отправки."""
 
-    send_mail(
+    enqueue(
+        email,
         'Письмо с кодом подтверждения',
         f'Код подтверждения - {confirmation_code}',
-        settings.EMAIL_YAMDB_ADDRESS,
-        (email,),
-        False,
     )
+
+
+def batches(rows, batch_size):
+    """Разбивает поток строк на пачки заданного размера."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -1,16 +1,26 @@
 from http import HTTPStatus
 
-from django.db.models import Avg
 from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets, permissions
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
-from .filters import TitleFilter
-from .mixins import CreateListDestroyViewSet
+from .bulk import BULK_MAX_TITLES, ERROR, bulk_save_titles
+from .cache import title_cache
+from .exports import EXPORT_FORMATS, iter_titles
+from .filters import RelevanceOrderingFilter, TitleFilter
+from .mixins import (CachedListMixin, ConditionalGetMixin,
+                     CreateListDestroyViewSet, NestedParentMixin,
+                     SparseFieldsMixin, ValuesReadMixin)
+from .parsers import FastJSONParser, NDJSONParser
+from .read_serializers import (CommentReadSerializer, ReviewReadSerializer,
+                               TitleReadSerializer)
 from .permissions import (IsAdmin, ReadOnly, IsAdminModeratorOwnerOrReadOnly)
 from .serializers import (TitleSerializer, CategorySerializer,
                           GenreSerializer, TitleCreateSerializer,
@@ -18,21 +28,32 @@ from .serializers import (TitleSerializer, CategorySerializer,
                           UserSerializer, CommentSerializer, ReviewSerializer)
 from titles.models import Title, Category, Genre
 from users.models import User
-from reviews.models import Review
+from reviews.models import Comment, Review
 
 from .utils import send_letter
 
+MULTI_GET_MAX_IDS = 100
+# Значения, которые помещаются в целочисленный первичный ключ.
+TITLE_ID_RANGE = range(1, 2 ** 63)
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(ConditionalGetMixin, CachedListMixin, ValuesReadMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.only('pk').order_by())
+    )
     serializer_class = TitleSerializer
+    read_serializer_class = TitleReadSerializer
     permission_classes = (ReadOnly | IsAdmin,)
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    filter_backends = (DjangoFilterBackend, RelevanceOrderingFilter)
     ordering_fields = ('name', 'year', 'rating')
     ordering = ('name',)
+    keyset_ordering = ('name', 'id')
     filterset_class = TitleFilter
+    cache_models = (Title, Category, Genre, Review)
+    ids_query_param = 'ids'
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_serializer_class(self):
@@ -41,6 +62,131 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleSerializer
         return TitleCreateSerializer
 
+    def get_cache_params(self):
+        return super().get_cache_params() | {self.ids_query_param}
+
+    def list(self, request, *args, **kwargs):
+        """Список произведений или, с `?ids=1,2,3`, заданные произведения.
+
+        Произведения по id отдаются в порядке запроса без фильтров
+        и пагинации, отсутствующие id пропускаются.
+        """
+        if self.ids_query_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        title_ids = self.get_requested_ids()
+        titles = title_cache.get_many(title_ids)
+        missing = [title_id for title_id in title_ids
+                   if title_id not in titles]
+        if missing:
+            loaded = {
+                data['id']: data for data in TitleReadSerializer(
+                    self.get_queryset().filter(pk__in=missing), many=True
+                ).data
+            }
+            title_cache.set_many(loaded)
+            titles.update(loaded)
+        return Response({'results': [self.trim_fields(titles[title_id])
+                                     for title_id in title_ids
+                                     if title_id in titles]})
+
+    def get_requested_ids(self):
+        try:
+            title_ids = [
+                int(title_id)
+                for value in self.request.query_params.getlist(
+                    self.ids_query_param
+                )
+                for title_id in value.split(',') if title_id.strip()
+            ]
+            if not all(title_id in TITLE_ID_RANGE for title_id in title_ids):
+                raise ValueError
+        except ValueError:
+            raise ValidationError({self.ids_query_param: [
+                'Ожидались id произведений через запятую.'
+            ]})
+        title_ids = list(dict.fromkeys(title_ids))
+        if len(title_ids) > MULTI_GET_MAX_IDS:
+            raise ValidationError({self.ids_query_param: [
+                f'Не больше {MULTI_GET_MAX_IDS} id за запрос.'
+            ]})
+        return title_ids
+
+    def retrieve(self, request, *args, **kwargs):
+        """Метод для получения произведения через кеш."""
+        try:
+            title_id = int(kwargs[self.lookup_field])
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+        data = title_cache.get(title_id)
+        if data is None:
+            response = super().retrieve(request, *args, **kwargs)
+            if self.get_sparse_fields() is not None:
+                return response
+            data = response.data
+            title_cache.set(title_id, data)
+        return Response(self.trim_fields(data))
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='export',
+        permission_classes=(IsAdmin,)
+    )
+    def export(self, request):
+        """Потоковая выгрузка всех произведений в NDJSON или CSV."""
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'export_format': f'Допустимые форматы: '
+                                  f'{", ".join(EXPORT_FORMATS)}.'}
+            )
+        render, content_type = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None)
+        response = StreamingHttpResponse(render(iter_titles(queryset)),
+                                         content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        permission_classes=(IsAdmin,),
+        parser_classes=(FastJSONParser, NDJSONParser)
+    )
+    def bulk(self, request):
+        """Создание и изменение пачки произведений из JSON-массива или NDJSON.
+
+        Ответ содержит результат по каждому элементу: 201, если все
+        элементы сохранены, 207 при частичной ошибке и 400, если не
+        сохранено ничего.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(
+                {'non_field_errors': ['Ожидался непустой список '
+                                      'произведений.']}
+            )
+        if len(items) > BULK_MAX_TITLES:
+            raise ValidationError(
+                {'non_field_errors': [f'Не больше {BULK_MAX_TITLES} '
+                                      f'произведений за запрос.']}
+            )
+        results = bulk_save_titles(items, self.get_serializer_context())
+        failed = sum(result['status'] == ERROR for result in results)
+        if not failed:
+            status = HTTPStatus.CREATED
+        elif failed < len(results):
+            status = HTTPStatus.MULTI_STATUS
+        else:
+            status = HTTPStatus.BAD_REQUEST
+        return Response({'saved': len(results) - failed, 'failed': failed,
+                         'results': results}, status=status)
+
 
 class CategoryViewSet(CreateListDestroyViewSet):
     """Вьюсет для категорий."""
@@ -56,7 +202,7 @@ class GenreViewSet(CreateListDestroyViewSet):
     serializer_class = GenreSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """Вьюсет для изменения и удаления пользователя."""
 
     queryset = User.objects.all()
@@ -85,44 +231,62 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=HTTPStatus.OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, NestedParentMixin, ValuesReadMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет для отзывов."""
 
     serializer_class = ReviewSerializer
+    read_serializer_class = ReviewReadSerializer
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,
                           IsAdminModeratorOwnerOrReadOnly)
+    keyset_ordering = ('-pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return [(Review, self.kwargs.get('title_id')), (User, None)]
+
+    def get_parent_queryset(self):
+        return Title.objects.filter(pk=self.kwargs.get('title_id'))
 
     def get_queryset(self):
         """Метод для получения queryset с отзывами."""
-        return self.get_title().reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author')
 
     def perform_create(self, serializer):
         """Метод для сохранения отзыва с автором текущего пользователя."""
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(author=self.request.user,
+                        title_id=int(self.kwargs['title_id']))
 
-    def get_title(self):
-        """Метод для получения объекта Title."""
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
-
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, NestedParentMixin,
+                     ValuesReadMixin, viewsets.ModelViewSet):
     """Вьюсет для комментариев."""
 
     serializer_class = CommentSerializer
+    read_serializer_class = CommentReadSerializer
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,
                           IsAdminModeratorOwnerOrReadOnly,)
+    keyset_ordering = ('-pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return [(Comment, self.kwargs.get('review_id')), (User, None)]
+
+    def get_parent_queryset(self):
+        return Review.objects.filter(pk=self.kwargs.get('review_id'),
+                                     title_id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
         """Метод для получения queryset с комментариями."""
-        return self.get_review().comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ).select_related('author')
 
     def perform_create(self, serializer):
         """Метод для сохранения комментария с автором текущего пользователя."""
-        serializer.save(author=self.request.user, review=self.get_review())
-
-    def get_review(self):
-        """Метод для получения объекта Review."""
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        serializer.save(author=self.request.user,
+                        review_id=int(self.kwargs['review_id']))
 
 
 @api_view(["POST"])
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from importlib.util import find_spec
 import os
 from pathlib import Path
 
@@ -22,14 +23,15 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'django_filters',
-    'api.apps.ApiConfig',
     'titles.apps.TitlesConfig',
     'users.apps.UsersConfig',
     'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,6 +68,33 @@ DATABASES = {
     }
 }
 
+# По умолчанию кеш в памяти процесса. Поколения моделей, по которым
+# строятся ETag, кеш списков и реестры категорий и жанров, видны всем
+# процессам сервера только в общем кеше, поэтому при нескольких процессах
+# нужен memcached или redis (предупреждение api.W001).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+TITLE_CACHE_ALIAS = 'default'
+TITLE_CACHE_TIMEOUT = 60 * 5
+LIST_CACHE_ALIAS = 'default'
+LIST_CACHE_TIMEOUT = 60 * 5
+
+# brotli и zstd используются, только если установлены их пакеты.
+COMPRESSION_ENCODINGS = ('br', 'zstd', 'gzip')
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CONTENT_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/msgpack',
+    'application/cbor',
+    'text/csv',
+    'text/html',
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -98,6 +127,13 @@ CSV_DIRS = os.path.join(BASE_DIR, 'static/data')
 
 AUTH_USER_MODEL = 'users.User'
 
+# Бинарные форматы по заголовку Accept, если установлен их пакет.
+BINARY_FORMATS = (
+    ('msgpack', 'api.renderers.MessagePackRenderer',
+     'api.parsers.MessagePackParser'),
+    ('cbor2', 'api.renderers.CBORRenderer', 'api.parsers.CBORParser'),
+)
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -106,8 +142,22 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination'
-                                '.PageNumberPagination',
+    # orjson необязателен: без него работают обычные JSONRenderer/Parser.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        *(renderer for package, renderer, _ in BINARY_FORMATS
+          if find_spec(package)),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        *(parser for package, _, parser in BINARY_FORMATS
+          if find_spec(package)),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination'
+                                '.KeysetPageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
@@ -119,3 +169,15 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 EMAIL_YAMDB_ADDRESS = 'donotreply@yamdb.ru'
+
+# Очередь писем: signup только пишет в нее, отправляет команда send_emails.
+# В режиме EMAIL_OUTBOX_EAGER письмо уходит сразу при постановке.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_WORKERS = 4
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Секунд до первой повторной попытки, дальше пауза удваивается.
+EMAIL_OUTBOX_BACKOFF = 30
+EMAIL_OUTBOX_MAX_BACKOFF = 60 * 60
+# Секунд, на которые взятое в отправку письмо скрыто от других обработчиков.
+EMAIL_OUTBOX_LEASE = 5 * 60
@@ -41,6 +41,10 @@ class Review(TextAuthorDateModel):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
+        indexes = [
+            models.Index(fields=['title', '-pub_date', 'id'],
+                         name='review_title_pub_date_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -48,9 +52,18 @@ class Review(TextAuthorDateModel):
             ),
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.remember_loaded_state()
+
     def __str__(self):
         return f'Отзыв {self.author} на {self.title}'
 
+    def remember_loaded_state(self):
+        """Запоминает сохраненные в базе оценку и произведение."""
+        self.loaded_title_id = self.__dict__.get('title_id')
+        self.loaded_score = self.__dict__.get('score')
+
 
 class Comment(TextAuthorDateModel):
     review = models.ForeignKey(
@@ -63,6 +76,10 @@ class Comment(TextAuthorDateModel):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(fields=['review', '-pub_date', 'id'],
+                         name='comment_review_pub_date_idx'),
+        ]
 
     def __str__(self):
         return f'Комментарий {self.author} на {self.review}'
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review
+from titles.models import Title
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учитывает новый или измененный отзыв в рейтинге произведения."""
+    if created:
+        Title.objects.filter(pk=instance.title_id).change_rating(
+            1, instance.score
+        )
+    elif instance.title_id != instance.loaded_title_id:
+        Title.objects.filter(pk=instance.loaded_title_id).change_rating(
+            -1, -instance.loaded_score
+        )
+        Title.objects.filter(pk=instance.title_id).change_rating(
+            1, instance.score
+        )
+    elif instance.score != instance.loaded_score:
+        Title.objects.filter(pk=instance.title_id).change_rating(
+            0, instance.score - instance.loaded_score
+        )
+    instance.remember_loaded_state()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убирает удаленный отзыв из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении отзывов вместе с пользователем
+    или произведением.
+    """
+    Title.objects.filter(pk=instance.loaded_title_id).change_rating(
+        -1, -instance.loaded_score
+    )
@@ -1,15 +1,26 @@
 from django.contrib import admin
 
-from .models import Title, Category, Genre
+from .models import Title, Category, Genre, GenreTitle
 from reviews.models import Review, Comment
 
 
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+
+
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'year',
+    inlines = (GenreTitleInline,)
+    list_display = ('id', 'name', 'year', 'rating',
                     'description', 'get_genres', 'category')
+    readonly_fields = ('reviews_count', 'scores_sum', 'rating')
+    list_select_related = ('category',)
     list_display_links = ('name', 'get_genres', 'category')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('genre')
+
     @admin.display(description='Жанр')
     def get_genres(self, obj):
         return ', '.join([str(genre) for genre in obj.genre.all()])
@@ -0,0 +1,64 @@
+import csv
+import os
+
+from django.core.management import BaseCommand
+
+from api.utils import batches
+from .load_csv import FILENAMES_TO_MODELS, FOREIGN_FIELDS
+
+CHUNK_SIZE = 2000
+COLUMNS_TO_FOREIGN_FIELDS = {
+    attname: column for column, attname in FOREIGN_FIELDS.items()
+}
+# Учетные данные не покидают базу.
+EXCLUDED_FIELDS = {'password'}
+
+
+def dumped_fields(model):
+    return [field.attname for field in model._meta.concrete_fields
+            if field.attname not in EXCLUDED_FIELDS]
+
+
+def table_columns(model):
+    """Колонки csv модели в формате, который читает load_csv."""
+    return [COLUMNS_TO_FOREIGN_FIELDS.get(attname, attname)
+            for attname in dumped_fields(model)]
+
+
+class Command(BaseCommand):
+    """Класс команды для выгрузки базы данных в csv-файлы для load_csv."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_dir',
+            help='Папка, в которую будут записаны csv-файлы.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.'
+        )
+
+    def handle(self, *args, **kwargs):
+        os.makedirs(kwargs['csv_dir'], exist_ok=True)
+        for filename, model_name in FILENAMES_TO_MODELS.items():
+            csv_path = os.path.join(kwargs['csv_dir'], filename + '.csv')
+            written = self.dump_table(model_name, csv_path,
+                                      kwargs['chunk_size'])
+            print(f'{filename}: выгружено {written} строк')
+        print('Все данные были успешно выгружены')
+
+    def dump_table(self, model_name, csv_path, chunk_size):
+        """Записывает таблицу в файл по мере чтения курсором."""
+        rows = model_name.objects.order_by('pk').values_list(
+            *dumped_fields(model_name)
+        ).iterator(chunk_size=chunk_size)
+        written = 0
+        with open(csv_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(table_columns(model_name))
+            for chunk in batches(rows, chunk_size):
+                writer.writerows(chunk)
+                written += len(chunk)
+        return written
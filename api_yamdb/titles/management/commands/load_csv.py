@@ -1,11 +1,21 @@
 import csv
+import hashlib
+import json
 import os
+import time
+from collections import Counter
+from concurrent.futures import (Executor, Future, FIRST_COMPLETED,
+                                ThreadPoolExecutor, wait)
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.core.management.color import no_style
 from django.conf import settings
+from django.db import connection, connections, transaction, IntegrityError
 
+from api.cache import invalidate_all
+from api.utils import batches
 from reviews.models import Review, Comment
-from titles.models import Genre, Category, GenreTitle, Title
+from titles.models import Genre, Category, GenreTitle, ImportedRow, Title
 from users.models import User
 
 FILENAMES_TO_MODELS = {
@@ -19,45 +29,359 @@ FILENAMES_TO_MODELS = {
 }
 
 FOREIGN_FIELDS = {
-    'category': ('category', Category),
-    'title_id': ('title', Title),
-    'author': ('author', User),
-    'review_id': ('review', Review),
-    'genre_id': ('genre', Genre),
+    'category': 'category_id',
+    'title_id': 'title_id',
+    'author': 'author_id',
+    'review_id': 'review_id',
+    'genre_id': 'genre_id',
 }
 
+BATCH_SIZE = 1000
+
 
 def fix_data(csv_data):
-    csv_data_copy = csv_data.copy()
-    for key, value in csv_data.items():
-        if key in FOREIGN_FIELDS:
-            csv_new_key = FOREIGN_FIELDS[key][0]
-            csv_data_copy[csv_new_key] = FOREIGN_FIELDS[key][1].objects.get(
-                pk=value
-            )
-    return csv_data_copy
+    """Переводит внешние ключи csv в поля `*_id` без запросов к базе."""
+    return {FOREIGN_FIELDS.get(key, key): value
+            for key, value in csv_data.items()}
+
+
+def read_rows(csv_path):
+    """Лениво читает строки csv-файла."""
+    with open(csv_path, encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            yield fix_data(row)
+
+
+def read_export(export_path):
+    """Лениво читает выгрузку произведений в NDJSON или CSV (по расширению)."""
+    with open(export_path, encoding='utf-8', newline='') as file:
+        if export_path.endswith('.csv'):
+            for row in csv.DictReader(file):
+                row['genre'] = [slug for slug in row['genre'].split(',')
+                                if slug]
+                yield row
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def build_instance(model, row):
+    """Создает объект модели, считая пустые значения nullable-полей NULL."""
+    return model(**{
+        key: None if value == '' and model._meta.get_field(key).null
+        else value
+        for key, value in row.items()
+    })
+
+
+def row_hash(row):
+    """Хеш содержимого строки csv."""
+    return hashlib.sha1(
+        json.dumps(row, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def updatable_fields(model, row):
+    """Поля строки, которые можно обновить, кроме заполняемых базой."""
+    fields = []
+    for name in row:
+        field = model._meta.get_field(name)
+        if not (field.primary_key or getattr(field, 'auto_now_add', False)
+                or getattr(field, 'auto_now', False)):
+            fields.append(name)
+    return fields
+
+
+def reset_sequences(model):
+    """Сдвигает счетчик первичного ключа после вставки с явными id."""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), (model,)):
+            cursor.execute(sql)
+
+
+def dependency_graph(filenames_to_models):
+    """Строит граф зависимостей файлов по внешним ключам моделей."""
+    models_to_filenames = {
+        model: filename for filename, model in filenames_to_models.items()
+    }
+    return {
+        filename: {
+            models_to_filenames[field.related_model]
+            for field in model._meta.get_fields()
+            if field.many_to_one and field.concrete
+            and field.related_model in models_to_filenames
+            and field.related_model is not model
+        }
+        for filename, model in filenames_to_models.items()
+    }
+
+
+def default_workers():
+    """SQLite не допускает параллельной записи, поэтому грузим в один поток."""
+    if connection.vendor == 'sqlite':
+        return 1
+    return os.cpu_count() or 1
+
+
+class InlineExecutor(Executor):
+    """Исполнитель, выполняющий задачи сразу в текущем потоке."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
 
 
 class Command(BaseCommand):
     """Класс команды для загрузки в базу данных."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--csv-dir',
+            default=settings.CSV_DIRS,
+            help='Папка с csv-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном INSERT.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Количество таблиц, загружаемых параллельно.'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Записывать только новые и изменившиеся строки.'
+        )
+        parser.add_argument(
+            '--titles-export',
+            default=None,
+            help='Загрузить только произведения из выгрузки '
+                 '/api/v1/titles/export/ в NDJSON или CSV.'
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help='В режиме --incremental удалять ранее загруженные строки, '
+                 'которых больше нет в файлах.'
+        )
+
     def handle(self, *args, **kwargs):
-        for filename, model_name in FILENAMES_TO_MODELS.items():
-            csv_path = os.path.join(settings.CSV_DIRS, filename + '.csv')
+        self.batch_size = kwargs['batch_size']
+        if kwargs['titles_export']:
+            self.handle_titles_export(kwargs['titles_export'])
+            return
+        csv_paths = {}
+        for filename in FILENAMES_TO_MODELS:
+            csv_path = os.path.join(kwargs['csv_dir'], filename + '.csv')
             if not os.path.exists(csv_path):
                 print(f'Файл по пути {csv_path} не найден')
                 return
-            with open(csv_path, encoding='utf-8') as file:
-                all_data = list(csv.reader(file))
-            headers = all_data[0]
-            data = all_data[1:]
-            for row in data:
-                data_to_save = dict(zip(headers, row))
-                data_to_save = fix_data(data_to_save)
-                try:
-                    final_data = model_name(**data_to_save)
-                    final_data.save()
-                except ValueError as error:
-                    print(f'Ошибка: {error}\nЗапись не была загружена.')
-                    return
+            csv_paths[filename] = csv_path
+        self.incremental = kwargs['incremental']
+        self.delete_missing = kwargs['delete_missing']
+        workers = kwargs['workers'] or default_workers()
+        try:
+            results = self.load_files(csv_paths, workers)
+        except (ValueError, IntegrityError) as error:
+            print(f'Ошибка: {error}\nЗапись не была загружена.')
+            invalidate_all()
+            return
+        for filename, stats in results.items():
+            print(f'{filename}: добавлено {stats["inserted"]}, '
+                  f'обновлено {stats["updated"]}, '
+                  f'без изменений {stats["unchanged"]}, '
+                  f'удалено {stats["deleted"]}')
+        review_stats = results['review']
+        if review_stats['inserted'] or review_stats['updated']:
+            Title.objects.recalculate_rating()
+        invalidate_all()
         print('Все данные были успешно загружены')
+
+    def handle_titles_export(self, export_path):
+        """Создает и обновляет произведения из выгрузки по их id.
+
+        Категория и жанры ищутся по slug, рейтинг пересчитывается
+        по отзывам.
+        """
+        if not os.path.exists(export_path):
+            print(f'Файл по пути {export_path} не найден')
+            return
+        category_ids = dict(Category.objects.values_list('slug', 'pk'))
+        genre_ids = dict(Genre.objects.values_list('slug', 'pk'))
+        stats = Counter(inserted=0, updated=0)
+        try:
+            with transaction.atomic():
+                for batch in batches(read_export(export_path),
+                                     self.batch_size):
+                    self.save_export_batch(batch, category_ids, genre_ids,
+                                           stats)
+                reset_sequences(Title)
+        except (ValueError, KeyError, IntegrityError) as error:
+            print(f'Ошибка: {error}\nЗапись не была загружена.')
+            return
+        Title.objects.recalculate_rating()
+        invalidate_all()
+        print(f'titles: добавлено {stats["inserted"]}, '
+              f'обновлено {stats["updated"]}')
+
+    def save_export_batch(self, batch, category_ids, genre_ids, stats):
+        """Записывает пачку произведений выгрузки и заменяет их жанры."""
+        titles, links = [], []
+        for record in batch:
+            category = record['category'] or None
+            missing = [slug for slug in record['genre']
+                       if slug not in genre_ids]
+            if category is not None and category not in category_ids:
+                missing.append(category)
+            if missing:
+                raise ValueError(f'Произведение {record["id"]}: не найдены '
+                                 f'slug {", ".join(missing)}')
+            title = Title(pk=int(record['id']), name=record['name'],
+                          year=int(record['year']),
+                          description=record['description'] or '',
+                          category_id=category_ids.get(category))
+            titles.append(title)
+            links.extend(GenreTitle(title_id=title.pk,
+                                    genre_id=genre_ids[slug])
+                         for slug in record['genre'])
+        existing = set(Title.objects.filter(
+            pk__in=[title.pk for title in titles]
+        ).values_list('pk', flat=True))
+        to_update = [title for title in titles if title.pk in existing]
+        Title.objects.bulk_create(
+            [title for title in titles if title.pk not in existing]
+        )
+        Title.objects.bulk_update(
+            to_update, ('name', 'year', 'description', 'category')
+        )
+        GenreTitle.objects.filter(title_id__in=[title.pk for title in titles]
+                                  ).delete()
+        GenreTitle.objects.bulk_create(links)
+        stats['inserted'] += len(titles) - len(to_update)
+        stats['updated'] += len(to_update)
+
+    def load_files(self, csv_paths, workers):
+        """Загружает таблицы по мере загрузки тех, на которые они ссылаются."""
+        pending = dependency_graph(FILENAMES_TO_MODELS)
+        results = {}
+        running = {}
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            load = self.load_file_in_thread
+        else:
+            executor = InlineExecutor()
+            load = self.load_file
+        with executor:
+            while pending or running:
+                ready = [filename for filename, dependencies
+                         in pending.items() if dependencies <= set(results)]
+                for filename in ready:
+                    del pending[filename]
+                    running[executor.submit(
+                        load, filename, csv_paths[filename]
+                    )] = filename
+                if not running:
+                    raise CommandError(
+                        f'Циклическая зависимость таблиц: {", ".join(pending)}'
+                    )
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[running.pop(future)] = future.result()
+        return results
+
+    def load_file_in_thread(self, *args):
+        try:
+            return self.load_file(*args)
+        finally:
+            connections.close_all()
+
+    def load_file(self, filename, csv_path):
+        """Загружает файл пачками в одной транзакции."""
+        model = FILENAMES_TO_MODELS[filename]
+        stats = Counter(inserted=0, updated=0, unchanged=0, deleted=0)
+        started = time.monotonic()
+        with transaction.atomic():
+            known = {}
+            if self.incremental:
+                known = {
+                    row_id: (pk, content_hash)
+                    for pk, row_id, content_hash in ImportedRow.objects.filter(
+                        source=filename
+                    ).values_list('pk', 'row_id', 'content_hash')
+                }
+            for batch in batches(read_rows(csv_path), self.batch_size):
+                self.save_batch(filename, model, batch, known, stats)
+                self.report(filename, sum(stats.values()), started)
+            if self.incremental and self.delete_missing and known:
+                stats['deleted'] = self.delete_rows(filename, model, known)
+            reset_sequences(model)
+        return stats
+
+    def save_batch(self, filename, model, batch, known, stats):
+        """Вставляет новые строки пачки и обновляет изменившиеся.
+
+        Строка с прежним хешем пропускается, только если она еще есть
+        в базе: удаленные мимо загрузчика строки восстанавливаются.
+        """
+        to_create, to_update, new_rows, changed_rows = [], [], [], []
+        previous_rows = [known.pop(int(row['id']), None) for row in batch]
+        existing = set()
+        if self.incremental:
+            existing = set(model.objects.filter(
+                pk__in=[row['id'] for row in batch]
+            ).values_list('pk', flat=True))
+        for row, previous in zip(batch, previous_rows):
+            row_id = int(row['id'])
+            content_hash = row_hash(row)
+            if previous is None:
+                if self.incremental:
+                    new_rows.append(ImportedRow(source=filename,
+                                                row_id=row_id,
+                                                content_hash=content_hash))
+            elif previous[1] != content_hash:
+                changed_rows.append(ImportedRow(pk=previous[0],
+                                                content_hash=content_hash))
+            elif row_id in existing:
+                stats['unchanged'] += 1
+                continue
+            if row_id in existing:
+                to_update.append(build_instance(model, row))
+            else:
+                to_create.append(build_instance(model, row))
+        model.objects.bulk_create(to_create, batch_size=self.batch_size)
+        if to_update:
+            model.objects.bulk_update(
+                to_update, updatable_fields(model, batch[0]),
+                batch_size=self.batch_size
+            )
+        ImportedRow.objects.bulk_create(new_rows, batch_size=self.batch_size)
+        ImportedRow.objects.bulk_update(changed_rows, ('content_hash',),
+                                        batch_size=self.batch_size)
+        stats['inserted'] += len(to_create)
+        stats['updated'] += len(to_update)
+
+    def delete_rows(self, filename, model, missing):
+        """Удаляет ранее загруженные строки, которых нет в файле."""
+        deleted = 0
+        for chunk in batches(missing, self.batch_size):
+            deleted += model.objects.filter(pk__in=chunk).delete()[1].get(
+                model._meta.label, 0
+            )
+            ImportedRow.objects.filter(source=filename,
+                                       row_id__in=chunk).delete()
+        return deleted
+
+    def report(self, filename, loaded, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        print(f'{filename}: обработано {loaded} строк, '
+              f'{loaded / elapsed:.0f} строк/с')
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from api.cache import invalidate_all
+from titles.models import Title
+
+
+class Command(BaseCommand):
+    """Класс команды для пересчета рейтингов произведений с нуля."""
+
+    def handle(self, *args, **kwargs):
+        updated = Title.objects.recalculate_rating()
+        invalidate_all()
+        print(f'Рейтинг пересчитан для произведений: {updated}')
@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-18 18:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+import titles.models
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('titles', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    reviews_count = Coalesce(
+        Subquery(reviews.annotate(value=Count('pk')).values('value')),
+        Value(0)
+    )
+    scores_sum = Coalesce(
+        Subquery(reviews.annotate(value=Sum('score')).values('value')),
+        Value(0)
+    )
+    Title.objects.update(
+        reviews_count=reviews_count,
+        scores_sum=scores_sum,
+        rating=titles.models.rating_expression(reviews_count, scores_sum),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0001_initial'),
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, db_index=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='scores_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
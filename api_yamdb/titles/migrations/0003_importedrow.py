@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, verbose_name='Файл')),
+                ('row_id', models.BigIntegerField(verbose_name='Первичный ключ')),
+                ('content_hash', models.CharField(max_length=40, verbose_name='Хеш содержимого')),
+            ],
+            options={
+                'verbose_name': 'Загруженная строка',
+                'verbose_name_plural': 'Загруженные строки',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedrow',
+            constraint=models.UniqueConstraint(fields=('source', 'row_id'), name='unique_imported_row'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+SEARCH_INDEXES = {
+    'titles_title': ('name', 'description'),
+    'titles_category': ('name',),
+    'titles_genre': ('name',),
+}
+
+
+def sqlite_statements(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+              f"VALUES ('delete', old.id, {old});")
+    insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});'
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+        f'{insert} END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+        f'{delete} END',
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def postgresql_statements(table, columns):
+    return [
+        f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm '
+        f'ON {table} USING gin ({column} gin_trgm_ops)'
+        for column in columns
+    ]
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        statements = postgresql_statements
+    elif vendor == 'sqlite':
+        statements = sqlite_statements
+    else:
+        return
+    for table, columns in SEARCH_INDEXES.items():
+        for sql in statements(table, columns):
+            schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, columns in SEARCH_INDEXES.items():
+        if vendor == 'postgresql':
+            for column in columns:
+                schema_editor.execute(
+                    f'DROP INDEX IF EXISTS {table}_{column}_trgm'
+                )
+        elif vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(
+                    f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}'
+                )
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
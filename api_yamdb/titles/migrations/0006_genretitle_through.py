@@ -0,0 +1,70 @@
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def move_to_genre_title(apps, schema_editor):
+    """Переносит связи из автоматической таблицы в GenreTitle без дублей."""
+    Title = apps.get_model('titles', 'Title')
+    GenreTitle = apps.get_model('titles', 'GenreTitle')
+    db = schema_editor.connection.alias
+    links = GenreTitle.objects.using(db)
+    keep = links.values('title_id', 'genre_id').annotate(
+        keep_id=Min('id')
+    ).values_list('keep_id', flat=True)
+    links.exclude(id__in=list(keep)).delete()
+    existing = set(links.values_list('title_id', 'genre_id'))
+    links.bulk_create(
+        GenreTitle(title_id=title_id, genre_id=genre_id)
+        for title_id, genre_id in Title.genre.through.objects.using(
+            db
+        ).values_list('title_id', 'genre_id')
+        if (title_id, genre_id) not in existing
+    )
+
+
+def move_to_auto_table(apps, schema_editor):
+    Title = apps.get_model('titles', 'Title')
+    GenreTitle = apps.get_model('titles', 'GenreTitle')
+    db = schema_editor.connection.alias
+    Through = Title.genre.through
+    Through.objects.using(db).bulk_create(
+        Through(title_id=title_id, genre_id=genre_id)
+        for title_id, genre_id in GenreTitle.objects.using(
+            db
+        ).values_list('title_id', 'genre_id')
+    )
+
+
+def drop_auto_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('titles', 'Title').genre.through)
+
+
+def create_auto_table(apps, schema_editor):
+    schema_editor.create_model(apps.get_model('titles', 'Title').genre.through)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0005_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_to_genre_title, move_to_auto_table),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_auto_table, create_auto_table),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(related_name='title', through='titles.GenreTitle', to='titles.Genre', verbose_name='Жанр'),
+                ),
+            ],
+        ),
+    ]
@@ -1,4 +1,9 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import (Count, F, FloatField, OuterRef, Subquery,
+                              Sum, Value)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.signals import m2m_changed
 from django.core.validators import MaxValueValidator
 
 from api.consts import (TEXT_LENGTH,
@@ -19,6 +24,10 @@ class NameSlugModel(models.Model):
     class Meta:
         abstract = True
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name', 'id'],
+                         name='%(class)s_name_idx'),
+        ]
 
     def __str__(self):
         return self.name[:TEXT_LENGTH]
@@ -40,6 +49,44 @@ class Genre(NameSlugModel):
         verbose_name_plural = 'Жанры'
 
 
+def rating_expression(reviews_count, scores_sum):
+    """Выражение рейтинга: средняя оценка или NULL при отсутствии отзывов."""
+    return Cast(scores_sum, FloatField()) / NullIf(reviews_count, 0)
+
+
+class TitleQuerySet(models.QuerySet):
+    """Queryset произведений с обслуживанием хранимого рейтинга."""
+
+    def change_rating(self, count_delta, score_delta):
+        """Инкрементально сдвигает счетчики отзывов одним UPDATE."""
+        reviews_count = F('reviews_count') + count_delta
+        scores_sum = F('scores_sum') + score_delta
+        return self.update(
+            reviews_count=reviews_count,
+            scores_sum=scores_sum,
+            rating=rating_expression(reviews_count, scores_sum),
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает счетчики отзывов с нуля по таблице отзывов."""
+        reviews = apps.get_model('reviews', 'Review').objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        reviews_count = Coalesce(
+            Subquery(reviews.annotate(value=Count('pk')).values('value')),
+            Value(0)
+        )
+        scores_sum = Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')),
+            Value(0)
+        )
+        return self.update(
+            reviews_count=reviews_count,
+            scores_sum=scores_sum,
+            rating=rating_expression(reviews_count, scores_sum),
+        )
+
+
 class Title(models.Model):
     """Класс произведений."""
 
@@ -59,6 +106,7 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre,
+        through='GenreTitle',
         related_name='title',
         verbose_name='Жанр'
     )
@@ -69,15 +117,65 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         verbose_name='Категория'
     )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    scores_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Рейтинг'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year',)
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(fields=['category', 'year'],
+                         name='title_category_year_idx'),
+        ]
 
     def __str__(self):
         return self.name[:TEXT_LENGTH]
 
+    def add_genres(self, genre_ids):
+        """Добавляет связи с жанрами одним INSERT."""
+        genre_ids = set(genre_ids)
+        if not genre_ids:
+            return
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=self, genre_id=genre_id)
+            for genre_id in genre_ids
+        )
+        self.send_genres_changed('post_add', genre_ids)
+
+    def set_genres(self, genre_ids):
+        """Заменяет жанры, удаляя и добавляя только разницу."""
+        genre_ids = set(genre_ids)
+        links = GenreTitle.objects.filter(title=self)
+        current = set(links.values_list('genre_id', flat=True))
+        removed = current - genre_ids
+        if removed:
+            links.filter(genre_id__in=removed).delete()
+            self.send_genres_changed('post_remove', removed)
+        self.add_genres(genre_ids - current)
+
+    def send_genres_changed(self, action, genre_ids):
+        """Сигнал как у менеджера связи, чтобы сбросились кеши."""
+        m2m_changed.send(
+            sender=GenreTitle, instance=self, action=action, reverse=False,
+            model=Genre, pk_set=genre_ids, using=self._state.db
+        )
+
 
 class GenreTitle(models.Model):
     """Класс модели для связи жанров и произведений."""
@@ -96,6 +194,35 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'Связь жанра и произведения'
         verbose_name_plural = 'Связи жанров и произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_title'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} относится к жанру {self.genre}'
+
+
+class ImportedRow(models.Model):
+    """Класс хешей строк, загруженных командой load_csv."""
+
+    source = models.CharField(max_length=USERNAME_SLUG_SHOW_LENGTH,
+                              verbose_name='Файл')
+    row_id = models.BigIntegerField(verbose_name='Первичный ключ')
+    content_hash = models.CharField(max_length=40,
+                                    verbose_name='Хеш содержимого')
+
+    class Meta:
+        verbose_name = 'Загруженная строка'
+        verbose_name_plural = 'Загруженные строки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'row_id'],
+                name='unique_imported_row'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.source}:{self.row_id}'
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.models import Group
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import User
+from .models import OutboxEmail, User
 
 
 @admin.register(User)
@@ -28,4 +28,14 @@ class UserAdmin(BaseUserAdmin):
     list_editable = ('role',)
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('to', 'subject', 'status', 'attempts',
+                    'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to',)
+    # В тексте писем коды подтверждения.
+    exclude = ('body',)
+
+
 admin.site.unregister(Group)
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from users.outbox import deliver
+
+
+class Command(BaseCommand):
+    """Класс команды для отправки писем из очереди."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.EMAIL_OUTBOX_WORKERS,
+            help='Количество потоков отправки.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем на одно соединение с почтовым сервером.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершиться.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Секунд между проверками пустой очереди.'
+        )
+
+    def handle(self, *args, **kwargs):
+        while True:
+            stats = deliver(max(kwargs['workers'], 1),
+                            max(kwargs['batch_size'], 1))
+            if any(stats.values()):
+                print(f'Отправлено {stats["sent"]}, '
+                      f'отложено {stats["retry"]}, '
+                      f'не отправлено {stats["failed"]}')
+            if kwargs['once']:
+                return
+            time.sleep(kwargs['interval'])
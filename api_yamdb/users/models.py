@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
 
 from api.consts import NAME_LENGTH, EMAIL_LENGTH, USERNAME_SLUG_SHOW_LENGTH
 from api.validators import username_validator
@@ -50,3 +53,48 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_staff or self.is_superuser
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку командой send_emails."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+    to = models.EmailField('Получатель', max_length=EMAIL_LENGTH)
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    status = models.CharField(
+        'Статус',
+        choices=STATUSES,
+        default=PENDING,
+        max_length=max(len(status) for status, _ in STATUSES)
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt_at = models.DateTimeField('Следующая попытка',
+                                           default=timezone.now)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('-created_at',)
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'],
+                         name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
+
+    def message(self, connection=None):
+        return EmailMessage(self.subject, self.body,
+                            settings.EMAIL_YAMDB_ADDRESS, (self.to,),
+                            connection=connection)
@@ -0,0 +1,149 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+# Ошибки, после которых соединение с почтовым сервером непригодно.
+CONNECTION_ERRORS = (SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def enqueue(to, subject, body):
+    """Ставит письмо в очередь, в режиме EMAIL_OUTBOX_EAGER сразу шлет."""
+    email = OutboxEmail.objects.create(to=to, subject=subject, body=body)
+    if settings.EMAIL_OUTBOX_EAGER:
+        record([email], send_batch([email]))
+    return email
+
+
+def backoff(attempts):
+    """Пауза перед следующей попыткой, удваивается после каждой ошибки."""
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_BACKOFF
+    ))
+
+
+def claim(batch_size):
+    """Забирает пачку писем, которым пора уходить.
+
+    Письма откладываются на EMAIL_OUTBOX_LEASE, поэтому другие
+    обработчики их не возьмут, а после падения они вернутся в очередь.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(OutboxEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            status=OutboxEmail.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'pk')[:batch_size])
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE
+        ))
+    return emails
+
+
+def send_batch(emails):
+    """Отправляет пачку через одно соединение.
+
+    Возвращает {pk: текст ошибки или None}; к базе не обращается,
+    поэтому выполняется в потоках пула. Любое исключение записывается
+    в ошибку своего письма и не прерывает пачку. После обрыва соединение
+    открывается заново, а если это не удалось, остальные письма пачки
+    в результат не попадают и не тратят попытку.
+    """
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        return {email.pk: repr(error) for email in emails}
+    results = {}
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([email.message(connection)])
+            except Exception as error:
+                results[email.pk] = repr(error)
+                if (isinstance(error, CONNECTION_ERRORS)
+                        and not reopen(connection)):
+                    break
+            else:
+                results[email.pk] = None
+    finally:
+        connection.close()
+    return results
+
+
+def reopen(connection):
+    """Открывает оборванное соединение заново, False — если не удалось."""
+    connection.close()
+    try:
+        connection.open()
+    except Exception:
+        return False
+    return True
+
+
+def record(emails, results):
+    """Сохраняет итог отправки пачки, неудачные письма откладывает.
+
+    Письма без результата не тратят попытку и вернутся в очередь по
+    истечении аренды. Текст писем, которые больше не будут отправляться,
+    стирается: в нем коды подтверждения.
+    """
+    now = timezone.now()
+    stats = Counter()
+    OutboxEmail.objects.filter(
+        pk__in=[pk for pk, error in results.items() if error is None]
+    ).update(status=OutboxEmail.SENT, sent_at=now, last_error='', body='')
+    skipped = [email for email in emails if email.pk not in results]
+    stats['retry'] += len(skipped)
+    failed = [email for email in emails
+              if results.get(email.pk) is not None]
+    for email in failed:
+        email.attempts += 1
+        email.last_error = results[email.pk]
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmail.FAILED
+            email.body = ''
+            stats['failed'] += 1
+        else:
+            email.next_attempt_at = now + backoff(email.attempts)
+            stats['retry'] += 1
+    OutboxEmail.objects.bulk_update(
+        failed,
+        ('attempts', 'last_error', 'status', 'next_attempt_at', 'body')
+    )
+    stats['sent'] += len(emails) - len(failed) - len(skipped)
+    return stats
+
+
+def deliver(workers, batch_size):
+    """Отправляет все письма, которым пора уходить.
+
+    Пачки забираются и сохраняются в текущем потоке, а отправляются
+    параллельно в пуле из `workers` потоков.
+    """
+    stats = Counter(sent=0, retry=0, failed=0)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batches = []
+            for _ in range(workers):
+                emails = claim(batch_size)
+                if not emails:
+                    break
+                batches.append(emails)
+            if not batches:
+                return stats
+            for emails, results in zip(
+                batches, executor.map(send_batch, batches)
+            ):
+                stats.update(record(emails, results))
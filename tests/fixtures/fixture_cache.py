@@ -0,0 +1,23 @@
+import pytest
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb-tests',
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    from django.core.cache import caches
+
+    from api.cache import TAXONOMY_REGISTRIES
+
+    # Свои кеши для тестов, чтобы не трогать настроенные в проекте.
+    settings.CACHES = TEST_CACHES
+    for cache in caches.all():
+        cache.clear()
+    for registry in TAXONOMY_REGISTRIES.values():
+        registry.invalidate()
+    yield
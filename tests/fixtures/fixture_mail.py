@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_outbox(settings):
+    """Письма уходят сразу, как того ждут проверки регистрации."""
+    settings.EMAIL_OUTBOX_EAGER = True
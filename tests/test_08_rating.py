@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(admin_client, title_id, 'a', 10).json()
+        create_single_review(user_client, title_id, 'b', 6)
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/',
+            data={'score': 2}
+        )
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки.'
+        )
+
+        user.delete()
+        assert self.get_rating(admin_client, title_id) == 2, (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении '
+            'отзывов вместе с автором.'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        )
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что без отзывов рейтинг произведения равен `None`.'
+        )
+
+    def test_02_recalculate_ratings(self, admin_client):
+        from titles.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'a', 7)
+        Title.objects.update(reviews_count=0, scores_sum=0, rating=None)
+
+        call_command('recalculate_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.reviews_count, title.scores_sum) == (1, 7), (
+            'Проверьте, что команда `recalculate_ratings` пересчитывает '
+            'счетчики отзывов с нуля.'
+        )
+        assert title.rating == 7
+
+        create_single_review(admin_client, titles[1]['id'], 'b', 3)
+        response = admin_client.get('/api/v1/titles/?ordering=-rating')
+        assert response.json()['results'][0]['id'] == title_id, (
+            'Проверьте, что произведения можно упорядочить по рейтингу.'
+        )
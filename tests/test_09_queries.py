@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    def test_01_titles_list_constant_queries(self, client, admin_client):
+        url = '/api/v1/titles/'
+        create_titles(admin_client)
+        few_titles = count_queries(client, url)
+        for _ in range(3):
+            admin_client.post('/api/v1/titles/', data={
+                'name': 'Еще одно произведение',
+                'year': 2000,
+                'genre': ['horror', 'comedy', 'drama'],
+                'category': 'films',
+            })
+        assert count_queries(client, url) == few_titles <= 3, (
+            'Проверьте, что список произведений загружает категории и жанры '
+            'фиксированным числом запросов, независимо от размера страницы.'
+        )
+
+    def test_02_query_budgets(self, client, admin_client, admin,
+                              user_client, user, moderator_client,
+                              moderator):
+        comments, reviews, titles = create_comments(admin_client, {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        })
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        budgets = {
+            '/api/v1/titles/': 3,
+            title_url: 2,
+            '/api/v1/categories/': 2,
+            '/api/v1/genres/': 2,
+            f'{title_url}reviews/': 2,
+            review_url: 1,
+            f'{review_url}comments/': 2,
+            f'{review_url}comments/{comments[0]["id"]}/': 1,
+        }
+        for url, budget in budgets.items():
+            queries = count_queries(client, url)
+            assert queries <= budget, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет не больше '
+                f'{budget} запросов к базе данных. Сейчас: {queries}.'
+            )
+
+    def test_03_comments_require_matching_title(self, client, admin_client,
+                                                admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = (f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        for path in (url, f'{url}{comments[0]["id"]}/'):
+            assert client.get(path).status_code == 404, (
+                'Проверьте, что комментарии к отзыву недоступны по адресу '
+                'с чужим `title_id`.'
+            )
+        response = admin_client.post(url, data={'text': 'comment'})
+        assert response.status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        ).status_code == 200, (
+            'Проверьте, что пустой список отзывов существующего '
+            'произведения возвращает ответ со статусом 200.'
+        )
+
+    def test_04_created_matches_detail(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        created = admin_client.post(url, data={'text': 'text', 'score': 5})
+        assert created.status_code == 201
+        url = f'{url}{created.json()["id"]}/'
+        assert created.json() == admin_client.get(url).json(), (
+            'Проверьте, что ответ на создание отзыва совпадает с ответом '
+            'на его получение.'
+        )
+        created = admin_client.post(f'{url}comments/', data={'text': 'text'})
+        assert created.status_code == 201
+        assert created.json() == admin_client.get(
+            f'{url}comments/{created.json()["id"]}/'
+        ).json(), (
+            'Проверьте, что ответ на создание комментария совпадает с '
+            'ответом на его получение.'
+        )
@@ -0,0 +1,102 @@
+import base64
+import json
+
+import pytest
+
+from tests.utils import create_genre, create_categories
+
+
+def collect_pages(client, url, link='next'):
+    names, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не выполняет COUNT(*).'
+        )
+        names.extend(item['name'] for item in data['results'])
+        url, pages = data[link], pages + 1
+    return names, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    def test_01_titles_cursor_pagination(self, client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        for index in range(12):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {index % 4}',
+                'year': 2000,
+                'genre': ['drama'],
+                'category': 'films',
+            })
+        expected = sorted(f'Произведение {index % 4}' for index in range(12))
+
+        names, pages = collect_pages(
+            client, '/api/v1/titles/?pagination=cursor'
+        )
+        assert names == expected and pages == 3, (
+            'Проверьте, что курсорная пагинация по `(name, id)` обходит все '
+            'произведения без пропусков и повторов.'
+        )
+
+        last_page = client.get('/api/v1/titles/?pagination=cursor').json()
+        while last_page['next']:
+            last_page = client.get(last_page['next']).json()
+        names, _ = collect_pages(client, last_page['previous'], 'previous')
+        assert len(names) == 10, (
+            'Проверьте, что по ссылкам `previous` можно вернуться в начало.'
+        )
+
+    def test_02_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == 404
+        for values in (['a', 'x'], ['a', None], ['a', {}], ['a', []]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({'v': values}).encode('utf-8')
+            ).decode('ascii')
+            response = client.get(f'/api/v1/titles/?cursor={cursor}')
+            assert response.status_code == 404, (
+                f'Проверьте, что курсор со значениями {values} неверного '
+                f'типа возвращает статус 404.'
+            )
+        cursor = base64.urlsafe_b64encode(
+            json.dumps({'v': ['not a date', 1]}).encode('utf-8')
+        ).decode('ascii')
+        assert client.get(
+            f'/api/v1/titles/1/reviews/?cursor={cursor}'
+        ).status_code == 404
+
+    def test_03_page_number_by_default(self, client):
+        data = client.get('/api/v1/titles/').json()
+        assert 'count' in data
+
+    def test_04_reviews_cursor_pagination(self, client, admin_client,
+                                          django_user_model):
+        from reviews.models import Review
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        title_id = admin_client.post('/api/v1/titles/', data={
+            'name': 'Произведение', 'year': 2000,
+            'genre': ['drama'], 'category': 'films',
+        }).json()['id']
+        for index in range(7):
+            author = django_user_model.objects.create_user(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            Review.objects.create(title_id=title_id, author=author,
+                                  text=f'review {index}', score=5)
+        url = f'/api/v1/titles/{title_id}/reviews/?pagination=cursor'
+        texts = []
+        while url:
+            data = client.get(url).json()
+            texts.extend(item['text'] for item in data['results'])
+            url = data['next']
+        assert texts == [f'review {index}' for index in reversed(range(7))], (
+            'Проверьте, что курсорная пагинация отзывов идет по '
+            '`(-pub_date, id)`.'
+        )
@@ -0,0 +1,130 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11LoadCsv:
+
+    def test_01_load_csv(self):
+        from reviews.models import Comment, Review
+        from titles.models import GenreTitle, Title
+
+        call_command('load_csv', batch_size=10)
+        assert Title.objects.count() == 32
+        assert GenreTitle.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        title = Title.objects.get(pk=1)
+        reviews = Review.objects.filter(title=title)
+        assert title.reviews_count == reviews.count(), (
+            'Проверьте, что после загрузки csv пересчитываются счетчики '
+            'отзывов произведений.'
+        )
+        assert title.scores_sum == sum(reviews.values_list('score',
+                                                           flat=True))
+
+    def test_02_dependency_graph(self):
+        from titles.management.commands.load_csv import (
+            FILENAMES_TO_MODELS, dependency_graph
+        )
+
+        assert dependency_graph(FILENAMES_TO_MODELS) == {
+            'category': set(),
+            'genre': set(),
+            'users': set(),
+            'titles': {'category'},
+            'genre_title': {'genre', 'titles'},
+            'review': {'titles', 'users'},
+            'comments': {'review', 'users'},
+        }, (
+            'Проверьте, что порядок загрузки таблиц строится по внешним '
+            'ключам моделей.'
+        )
+
+    def test_03_incremental_load(self, tmp_path, settings, capsys):
+        import shutil
+
+        from titles.models import Genre, GenreTitle, Title
+
+        shutil.copytree(settings.CSV_DIRS, tmp_path, dirs_exist_ok=True)
+        settings.CSV_DIRS = str(tmp_path)
+        call_command('load_csv', incremental=True)
+
+        call_command('load_csv', incremental=True)
+        output = capsys.readouterr().out
+        assert 'titles: добавлено 0, обновлено 0, без изменений 32' in output, (
+            'Проверьте, что повторная загрузка в режиме `--incremental` '
+            'не изменяет неизменившиеся строки.'
+        )
+
+        genre_csv = tmp_path / 'genre.csv'
+        lines = genre_csv.read_text(encoding='utf-8').splitlines()
+        lines[1] = lines[1].replace('Драма', 'Драмы')
+        lines.append('100,Новый жанр,new-genre')
+        genre_csv.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        genre_title_csv = tmp_path / 'genre_title.csv'
+        lines = genre_title_csv.read_text(encoding='utf-8').splitlines()
+        genre_title_csv.write_text('\n'.join(lines[:-1]) + '\n',
+                                   encoding='utf-8')
+
+        call_command('load_csv', incremental=True, delete_missing=True)
+        output = capsys.readouterr().out
+        assert 'genre: добавлено 1, обновлено 1, без изменений 14' in output
+        assert 'genre_title: добавлено 0, обновлено 0, без изменений 41, ' \
+               'удалено 1' in output
+        assert Genre.objects.get(pk=1).name == 'Драмы'
+        assert Genre.objects.filter(slug='new-genre').exists()
+        assert GenreTitle.objects.count() == 41
+        assert Title.objects.count() == 32
+
+    def test_05_incremental_restores_deleted(self, capsys):
+        from reviews.models import Review
+        from titles.models import ImportedRow, Title
+
+        call_command('load_csv')
+        assert not ImportedRow.objects.exists(), (
+            'Проверьте, что хеши строк пишутся только в режиме '
+            '`--incremental`.'
+        )
+        call_command('load_csv', incremental=True)
+        reviews_count = Review.objects.count()
+        Title.objects.filter(pk=1).delete()
+        capsys.readouterr()
+
+        call_command('load_csv', incremental=True)
+        output = capsys.readouterr().out
+        assert 'titles: добавлено 1, обновлено 0, без изменений 31' in output, (
+            'Проверьте, что `--incremental` восстанавливает строки, '
+            'удаленные мимо загрузчика.'
+        )
+        assert Title.objects.filter(pk=1).exists()
+        assert Review.objects.count() == reviews_count, (
+            'Проверьте, что восстанавливаются и строки, удаленные '
+            'каскадом.'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.reviews_count == title.reviews.count()
+
+    def test_04_dump_csv_round_trip(self, tmp_path):
+        from titles.management.commands.load_csv import FILENAMES_TO_MODELS
+        from titles.models import GenreTitle, ImportedRow, Title
+
+        call_command('load_csv')
+        titles = list(Title.objects.order_by('pk').values())
+        call_command('dump_csv', str(tmp_path))
+        users_header = (tmp_path / 'users.csv').read_text(
+            encoding='utf-8'
+        ).splitlines()[0]
+        assert 'password' not in users_header, (
+            'Проверьте, что `dump_csv` не выгружает хеши паролей.'
+        )
+        for model in reversed(FILENAMES_TO_MODELS.values()):
+            model.objects.all().delete()
+        ImportedRow.objects.all().delete()
+
+        call_command('load_csv', csv_dir=str(tmp_path))
+        assert list(Title.objects.order_by('pk').values()) == titles, (
+            'Проверьте, что выгрузка `dump_csv` загружается обратно '
+            'командой `load_csv` без потерь.'
+        )
+        assert GenreTitle.objects.count() == 42
@@ -0,0 +1,75 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleExport:
+    url = '/api/v1/titles/export/'
+
+    def test_01_export_permissions(self, client, user_client):
+        assert client.get(self.url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(self.url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_export_ndjson(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        response = admin_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = {record['id']: record for record in map(json.loads, lines)}
+        assert records[titles[0]['id']] == {
+            'id': titles[0]['id'],
+            'name': titles[0]['name'],
+            'year': titles[0]['year'],
+            'description': titles[0]['description'],
+            'category': categories[0]['slug'],
+            'genre': sorted(titles[0]['genre']),
+            'rating': 8,
+        }, (
+            'Проверьте, что выгрузка произведений содержит жанры, категорию '
+            'и рейтинг.'
+        )
+
+    def test_03_export_csv(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get(self.url, {'export_format': 'csv'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,name,year,description,category,genre,rating'
+        assert len(lines) == 3
+        response = admin_client.get(self.url, {'export_format': 'xml'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('export_format', ('ndjson', 'csv'))
+    def test_04_export_round_trip(self, admin_client, tmp_path,
+                                  export_format, capsys):
+        from django.core.management import call_command
+
+        from titles.models import GenreTitle, Title
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+
+        def export():
+            response = admin_client.get(self.url,
+                                        {'export_format': export_format})
+            return b''.join(response.streaming_content)
+
+        exported = export()
+        export_path = tmp_path / f'titles.{export_format}'
+        export_path.write_bytes(exported)
+        Title.objects.filter(pk=titles[0]['id']).update(name='Другое',
+                                                        category=None)
+        GenreTitle.objects.all().delete()
+        Title.objects.filter(pk=titles[1]['id']).delete()
+
+        call_command('load_csv', titles_export=str(export_path))
+        assert 'titles: добавлено 1, обновлено 1' in capsys.readouterr().out
+        assert export() == exported, (
+            'Проверьте, что выгрузка произведений загружается обратно '
+            'командой `load_csv --titles-export` без потерь.'
+        )
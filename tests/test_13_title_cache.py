@@ -0,0 +1,93 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleCache:
+
+    def test_01_detail_is_cached(self, client, admin_client, capsys):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        first = client.get(url).json()
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url).json()
+        assert second == first
+        assert not context.captured_queries, (
+            'Проверьте, что повторный запрос произведения отдается из кеша '
+            'без обращения к базе данных.'
+        )
+        call_command('title_cache_stats')
+        assert 'Попаданий: 1, промахов: 1' in capsys.readouterr().out
+
+    def test_02_cache_invalidation(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        client.get(url)
+
+        create_single_review(admin_client, title_id, 'text', 6)
+        assert client.get(url).json()['rating'] == 6, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+        admin_client.patch(url, data={'genre': [genres[2]['slug']]})
+        assert client.get(url).json()['genre'] == [genres[2]], (
+            'Проверьте, что изменение жанров сбрасывает кеш произведения.'
+        )
+
+        from titles.models import Genre
+        genre = Genre.objects.get(slug=genres[2]['slug'])
+        genre.name = 'Триллер'
+        genre.save()
+        assert client.get(url).json()['genre'][0]['name'] == 'Триллер', (
+            'Проверьте, что изменение жанра сбрасывает кеш произведений.'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        assert client.get(url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кеш произведений.'
+        )
+
+    def test_03_invalidation_after_commit(self, client, admin_client):
+        from django.db import transaction
+
+        from api.cache import title_cache
+        from titles.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        client.get(f'/api/v1/titles/{title_id}/')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.get(pk=title_id).save()
+                assert title_cache.get(title_id) is not None, (
+                    'Проверьте, что кеш сбрасывается после фиксации '
+                    'транзакции, а не до нее.'
+                )
+                raise RuntimeError
+        assert title_cache.get(title_id) is not None, (
+            'Проверьте, что откаченная запись не сбрасывает кеш.'
+        )
+        Title.objects.get(pk=title_id).save()
+        assert title_cache.get(title_id) is None
+
+    def test_04_moved_review(self, client, admin_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        urls = [f'/api/v1/titles/{title["id"]}/' for title in titles]
+        create_single_review(admin_client, titles[0]['id'], 'text', 6)
+        assert [client.get(url).json()['rating'] for url in urls] == [6,
+                                                                      None]
+        review = Review.objects.get()
+        review.title_id = titles[1]['id']
+        review.save()
+        assert [client.get(url).json()['rating'] for url in urls] == [None,
+                                                                      6], (
+            'Проверьте, что перенос отзыва сбрасывает кеш обоих '
+            'произведений.'
+        )
@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_counting_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response.json(), len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ListCache:
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/?ordering=-year&genre=comedy',
+        '/api/v1/categories/?search=Фильм',
+        '/api/v1/genres/',
+    ))
+    def test_01_repeated_list_is_cached(self, client, admin_client, url):
+        create_titles(admin_client)
+        first = client.get(url).json()
+        data, queries = get_counting_queries(client, url)
+        assert data == first and queries == 0, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдается из '
+            'кеша без обращения к базе данных.'
+        )
+
+    def test_02_params_are_normalized(self, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/?year=1984&name=Терминатор&utm=1')
+        _, queries = get_counting_queries(
+            client, '/api/v1/titles/?name=Терминатор&year=1984&page='
+        )
+        assert queries == 0, (
+            'Проверьте, что ключ кеша не зависит от порядка и пустых '
+            'параметров запроса.'
+        )
+        data, _ = get_counting_queries(client, '/api/v1/titles/?year=1988')
+        assert [title['year'] for title in data['results']] == [1988]
+
+    def test_03_writes_invalidate_lists(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?ordering=name'
+        client.get(url)
+        create_single_review(admin_client, titles[0]['id'], 'text', 9)
+        ratings = {title['id']: title['rating']
+                   for title in client.get(url).json()['results']}
+        assert ratings[titles[0]['id']] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кеш списка произведений.'
+        )
+
+        client.get('/api/v1/genres/')
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Вестерн', 'slug': 'western'})
+        assert client.get('/api/v1/genres/').json()['count'] == 4, (
+            'Проверьте, что новый жанр сбрасывает кеш списка жанров.'
+        )
@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def test_01_not_modified(self, client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            f'{comments[0]["id"]}/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.has_header('ETag') and response.has_header(
+                'Last-Modified'
+            ), f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным ETag '
+                'возвращает ответ со статусом 304.'
+            )
+            # Вложенным маршрутам нужна одна проверка родителя.
+            assert len(context.captured_queries) == (
+                1 if '/reviews/' in url else 0
+            ), (
+                f'Проверьте, что ответ 304 на `{url}` обращается к базе '
+                'только для проверки родителя.'
+            )
+
+    def test_02_etag_changes_after_write(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        other_reviews_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        etags = {url: client.get(url)['ETag']
+                 for url in (reviews_url, comments_url, other_reviews_url)}
+
+        admin_client.patch(f'{reviews_url}{review_id}/', data={'text': 'new'})
+        response = client.get(reviews_url,
+                              HTTP_IF_NONE_MATCH=etags[reviews_url])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов.'
+        )
+        response = client.get(other_reviews_url,
+                              HTTP_IF_NONE_MATCH=etags[other_reviews_url])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что изменение отзыва не меняет ETag отзывов '
+            'других произведений.'
+        )
+
+        admin_client.post(comments_url, data={'text': 'comment'})
+        response = client.get(comments_url,
+                              HTTP_IF_NONE_MATCH=etags[comments_url])
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_deleted_parent(self, client, admin_client, admin,
+                               django_user_model):
+        from reviews.models import Review
+        from titles.models import Title
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        empty_title = titles[1]['id']
+        urls = {
+            f'/api/v1/titles/{empty_title}/reviews/':
+                lambda: Title.objects.filter(pk=empty_title).delete(),
+        }
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        review = Review.objects.create(title_id=titles[0]['id'],
+                                       author=author, text='text', score=5)
+        urls[f'/api/v1/titles/{titles[0]["id"]}/reviews/{review.pk}/'
+             f'comments/'] = lambda: review.delete()
+        for url, delete_parent in urls.items():
+            etag = client.get(url)['ETag']
+            delete_parent()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что после удаления родителя `{url}` с прежним '
+                f'ETag возвращает 404, а не 304.'
+            )
+
+    def test_05_shared_cache_check(self, settings):
+        from api.checks import check_shared_caches
+
+        assert [warning.id for warning in check_shared_caches(None)] == [
+            'api.W001', 'api.W001'
+        ], (
+            'Проверьте, что о процессно-локальном кеше поколений выводится '
+            'предупреждение.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'api_cache',
+        }}
+        assert not check_shared_caches(None)
@@ -0,0 +1,85 @@
+import re
+
+import pytest
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from tests.utils import create_comments
+
+
+def main_queryset(viewset, path, kwargs=None, params=None):
+    view = viewset(action_map={'get': 'list'}, kwargs=kwargs or {},
+                   format_kwarg=None)
+    view.request = view.initialize_request(
+        APIRequestFactory().get(path, params)
+    )
+    return view.filter_queryset(view.get_queryset())
+
+
+def full_scans(queryset):
+    """Таблицы, которые план запроса читает целиком, без индекса."""
+    if connection.vendor == 'postgresql':
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    return [table for table, using in re.findall(
+        r'\bSCAN (?:TABLE )?(\w+)( USING| VIRTUAL TABLE INDEX)?',
+        queryset.explain()
+    ) if not using]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Indexes:
+
+    def test_01_main_queries_use_indexes(self, admin_client, admin):
+        from api import views
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        endpoints = {
+            '/api/v1/titles/': main_queryset(
+                views.TitleViewSet, '/api/v1/titles/'
+            ),
+            '/api/v1/titles/?category=&year=': main_queryset(
+                views.TitleViewSet, '/api/v1/titles/',
+                params={'category': 'films', 'year': 1984}
+            ),
+            '/api/v1/titles/?genre=': main_queryset(
+                views.TitleViewSet, '/api/v1/titles/',
+                params={'genre': 'comedy,drama'}
+            ),
+            '/api/v1/titles/?genre=&genre_match=all': main_queryset(
+                views.TitleViewSet, '/api/v1/titles/',
+                params={'genre': 'comedy,horror', 'genre_match': 'all'}
+            ),
+            '/api/v1/titles/?search=': main_queryset(
+                views.TitleViewSet, '/api/v1/titles/',
+                params={'search': 'терминатор'}
+            ),
+            '/api/v1/categories/': main_queryset(
+                views.CategoryViewSet, '/api/v1/categories/'
+            ),
+            '/api/v1/genres/': main_queryset(
+                views.GenreViewSet, '/api/v1/genres/'
+            ),
+            '/api/v1/genres/?search=': main_queryset(
+                views.GenreViewSet, '/api/v1/genres/',
+                params={'search': 'комедия'}
+            ),
+            '/api/v1/titles/{title_id}/reviews/': main_queryset(
+                views.ReviewViewSet, '/', {'title_id': title_id}
+            ),
+            '/api/v1/titles/{title_id}/reviews/{review_id}/comments/':
+                main_queryset(views.CommentViewSet, '/', {
+                    'title_id': title_id, 'review_id': review_id
+                }),
+        }
+        for url, queryset in endpoints.items():
+            scans = full_scans(queryset[:5])
+            assert not scans, (
+                f'Проверьте, что основной запрос `{url}` использует индексы. '
+                f'Сейчас таблицы читаются целиком: {", ".join(scans)}.'
+            )
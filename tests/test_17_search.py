@@ -0,0 +1,71 @@
+import pytest
+
+from tests.utils import create_genre, create_titles
+
+
+def names(response):
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Search:
+
+    def test_01_search_ranks_by_relevance(self, client):
+        from titles.models import Title
+
+        Title.objects.create(name='Дом у моря', year=2000,
+                             description='Рассказ о старом доме.')
+        Title.objects.create(name='Морской волк', year=2001,
+                             description='Капитан и его команда.')
+        Title.objects.create(name='Море', year=2002,
+                             description='Море, море и еще раз море.')
+        response = client.get('/api/v1/titles/?search=мор')
+        assert names(response)[0] == 'Море', (
+            'Проверьте, что результаты `?search=` отсортированы по '
+            'релевантности.'
+        )
+        assert set(names(response)) == {'Дом у моря', 'Морской волк',
+                                         'Море'}, (
+            'Проверьте, что `?search=` ищет слова по префиксу.'
+        )
+        response = client.get('/api/v1/titles/?search=мор&ordering=year')
+        assert names(response) == ['Дом у моря', 'Морской волк', 'Море'], (
+            'Проверьте, что явный `?ordering=` важнее сортировки поиска.'
+        )
+
+    def test_02_search_covers_description(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=yippie')
+        assert names(response) == ['Крепкий орешек'], (
+            'Проверьте, что `?search=` ищет и по описанию произведения.'
+        )
+        response = client.get('/api/v1/titles/?name=yippie')
+        assert not names(response), (
+            'Проверьте, что `?name=` ищет только по названию.'
+        )
+        response = client.get('/api/v1/titles/?name=терм')
+        assert names(response) == ['Терминатор']
+
+    def test_03_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(url, data={'name': 'Чужой'})
+        assert names(client.get('/api/v1/titles/?name=чужой')) == ['Чужой']
+        assert not names(client.get('/api/v1/titles/?name=терминатор')), (
+            'Проверьте, что поисковый индекс обновляется вместе с '
+            'произведением.'
+        )
+        admin_client.delete(url)
+        assert not names(client.get('/api/v1/titles/?name=чужой')), (
+            'Проверьте, что удаленное произведение пропадает из поиска.'
+        )
+
+    def test_04_genre_search(self, client, admin_client):
+        create_genre(admin_client)
+        response = client.get('/api/v1/genres/?search=ком')
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'comedy'
+        ], (
+            'Проверьте, что `?search=` у жанров ищет по началу слов '
+            'названия.'
+        )
@@ -0,0 +1,83 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def names(response):
+    return sorted(title['name'] for title in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SlugFilters:
+
+    url = '/api/v1/titles/'
+
+    def test_01_exact_slug(self, client, admin_client):
+        create_titles(admin_client)
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Хоррор-комедия', 'slug': 'horr'})
+        assert not names(client.get(f'{self.url}?genre=horr')), (
+            'Проверьте, что фильтр `genre` сравнивает slug целиком.'
+        )
+        assert names(client.get(f'{self.url}?genre=horror')) == [
+            'Терминатор'
+        ]
+        assert not names(client.get(f'{self.url}?category=film')), (
+            'Проверьте, что фильтр `category` сравнивает slug целиком.'
+        )
+
+    def test_02_multiple_slugs(self, client, admin_client):
+        create_titles(admin_client)
+        assert names(client.get(f'{self.url}?genre=comedy,drama')) == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что `?genre=a,b` возвращает произведения с любым '
+            'из жанров.'
+        )
+        assert names(client.get(
+            f'{self.url}?genre=comedy,horror&genre_match=all'
+        )) == ['Терминатор'], (
+            'Проверьте, что `genre_match=all` оставляет произведения со '
+            'всеми указанными жанрами.'
+        )
+        assert not names(client.get(
+            f'{self.url}?genre=comedy,drama&genre_match=all'
+        ))
+        assert not names(client.get(
+            f'{self.url}?genre=comedy,unknown&genre_match=all'
+        ))
+        assert names(client.get(f'{self.url}?genre=comedy,unknown')) == [
+            'Терминатор'
+        ]
+        assert names(client.get(f'{self.url}?category=films,books')) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        response = client.get(f'{self.url}?genre=comedy&genre_match=some')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_no_slug_join(self, client, admin_client):
+        create_titles(admin_client)
+        client.get(f'{self.url}?genre=comedy&category=films')
+        with CaptureQueriesContext(connection) as context:
+            client.get(f'{self.url}?genre=drama&category=books')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert not re.search(r'"slug" (=|IN|LIKE)', sql), (
+            'Проверьте, что slug жанров и категорий переводятся в id через '
+            'кеш, а запрос произведений фильтрует по внешним ключам.'
+        )
+
+    def test_04_slug_map_follows_changes(self, client, admin_client):
+        create_titles(admin_client)
+        client.get(f'{self.url}?genre=comedy')
+        admin_client.delete('/api/v1/genres/comedy/')
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Комедия', 'slug': 'comedy'})
+        assert not names(client.get(f'{self.url}?genre=comedy')), (
+            'Проверьте, что карта slug→id обновляется после изменения '
+            'жанров.'
+        )
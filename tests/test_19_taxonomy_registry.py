@@ -0,0 +1,128 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def taxonomy_queries(context):
+    """Запросы, читающие категории или названия и slug жанров."""
+    return [query['sql'] for query in context.captured_queries
+            if re.search(r'"titles_category"|"titles_genre"\."(name|slug)"',
+                         query['sql'])]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TaxonomyRegistry:
+
+    def test_01_render_without_taxonomy_queries(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            data = client.get('/api/v1/titles/').json()['results']
+            detail = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert not taxonomy_queries(context), (
+            'Проверьте, что категории и жанры произведений берутся из '
+            'реестра, а не из базы данных.'
+        )
+        terminator = next(title for title in data
+                          if title['id'] == titles[0]['id'])
+        assert terminator['category'] == detail['category'] == categories[0]
+        assert terminator['genre'] == detail['genre'] == genres[:2][::-1]
+
+    def test_02_validate_slugs_without_queries(self, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': 'Чужой',
+                'year': 1979,
+                'genre': ['horror', 'drama'],
+                'category': 'films',
+            })
+        assert response.status_code == 201
+        slug_lookups = [query['sql'] for query in context.captured_queries
+                        if re.search(r'"slug" (=|IN)', query['sql'])]
+        assert not slug_lookups, (
+            'Проверьте, что slug категорий и жанров проверяются по реестру '
+            'без запросов к базе данных.'
+        )
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['horror'],
+            'category': 'unknown',
+        })
+        assert response.status_code == 400
+        assert 'category' in response.json()
+
+    def test_03_refresh_on_foreign_changes(self, client, admin_client,
+                                           monkeypatch):
+        from api.cache import TaxonomyRegistry, list_cache
+        from titles.models import Genre
+
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        monkeypatch.setattr(TaxonomyRegistry, 'check_interval', 0)
+        # Изменение из другого процесса: сигналов нет, меняется поколение.
+        Genre.objects.filter(slug='drama').update(name='Триллер')
+        list_cache.bump(Genre)
+        data = client.get('/api/v1/titles/?genre=drama').json()['results']
+        assert data[0]['genre'] == [{'name': 'Триллер', 'slug': 'drama'}], (
+            'Проверьте, что реестр перечитывается при смене поколения '
+            'модели.'
+        )
+
+    def test_04_unknown_slug_forces_refresh(self, client, admin_client,
+                                            monkeypatch):
+        from api.cache import TaxonomyRegistry
+        from titles.models import Category, Genre
+
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        monkeypatch.setattr(TaxonomyRegistry, 'check_interval', 3600)
+        # Созданы другим процессом: ни сигналов, ни смены поколения.
+        Category.objects.bulk_create([Category(name='Сериал', slug='series')])
+        Genre.objects.bulk_create([Genre(name='Нуар', slug='noir')])
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Мальтийский сокол',
+            'year': 1941,
+            'genre': ['noir'],
+            'category': 'series',
+        })
+        assert response.status_code == 201, (
+            'Проверьте, что перед отказом по неизвестному slug реестр '
+            'перечитывается из базы данных.'
+        )
+        data = client.get('/api/v1/titles/?genre=noir').json()['results']
+        assert [title['name'] for title in data] == ['Мальтийский сокол']
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['noir'],
+            'category': 'unknown',
+        })
+        assert response.status_code == 400
+
+    def test_05_cached_responses_use_key_generation(self, client,
+                                                    admin_client,
+                                                    monkeypatch):
+        from api.cache import TaxonomyRegistry, list_cache
+        from titles.models import Category
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get('/api/v1/titles/')
+        monkeypatch.setattr(TaxonomyRegistry, 'check_interval', 3600)
+        # Переименование в другом процессе: сигналов нет, меняется
+        # только поколение, а срок проверки реестра еще не вышел.
+        Category.objects.filter(slug='films').update(name='Кинофильмы')
+        list_cache.bump(Category)
+        data = client.get('/api/v1/titles/').json()['results']
+        detail = client.get(url).json()
+        for title in (next(title for title in data
+                           if title['id'] == detail['id']), detail):
+            assert title['category']['name'] == 'Кинофильмы', (
+                'Проверьте, что ответ, сохраняемый в кеш и ETag, строится '
+                'по реестру того же поколения, что и ключ.'
+            )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories
+
+
+def create_many_genres(admin_client, count):
+    slugs = [f'genre-{number}' for number in range(count)]
+    for number, slug in enumerate(slugs):
+        admin_client.post('/api/v1/genres/',
+                          data={'name': f'Жанр {number:02}', 'slug': slug})
+    return slugs
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20GenreWrites:
+
+    url = '/api/v1/titles/'
+
+    def test_01_bulk_genre_insert(self, admin_client):
+        create_categories(admin_client)
+        slugs = create_many_genres(admin_client, 15)
+        admin_client.get(f'{self.url}?genre={slugs[0]}&category=books')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.url, data={
+                'name': 'Сборник', 'year': 2000, 'genre': slugs,
+                'category': 'books',
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert [genre['slug'] for genre in response.json()['genre']] == slugs
+        sql = [query['sql'] for query in context.captured_queries]
+        inserts = [query for query in sql
+                   if query.startswith('INSERT INTO "titles_genretitle"')]
+        assert len(inserts) == 1, (
+            'Проверьте, что связи с жанрами записываются одним INSERT '
+            'через модель GenreTitle.'
+        )
+        assert len(sql) <= 5, (
+            'Проверьте, что число запросов при создании произведения не '
+            f'зависит от числа жанров. Сейчас: {len(sql)}.'
+        )
+
+    def test_02_unknown_slugs_listed_together(self, admin_client):
+        create_categories(admin_client)
+        slugs = create_many_genres(admin_client, 2)
+        response = admin_client.post(self.url, data={
+            'name': 'Сборник', 'year': 2000,
+            'genre': [slugs[0], 'first-unknown', slugs[1], 'second-unknown'],
+            'category': 'books',
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        error = ' '.join(response.json()['genre'])
+        assert 'first-unknown' in error and 'second-unknown' in error, (
+            'Проверьте, что ошибка перечисляет все неизвестные slug жанров.'
+        )
+
+    def test_03_update_writes_difference(self, client, admin_client):
+        from titles.models import GenreTitle
+
+        create_categories(admin_client)
+        slugs = create_many_genres(admin_client, 4)
+        title = admin_client.post(self.url, data={
+            'name': 'Сборник', 'year': 2000, 'genre': slugs[:3],
+            'category': 'books',
+        }).json()
+        kept = set(GenreTitle.objects.filter(
+            genre__slug__in=slugs[1:3]
+        ).values_list('pk', flat=True))
+        url = f'{self.url}{title["id"]}/'
+        response = admin_client.patch(url, data={'genre': slugs[1:]})
+        assert response.status_code == HTTPStatus.OK
+        assert [genre['slug'] for genre in client.get(url).json()['genre']
+                ] == slugs[1:], (
+            'Проверьте, что изменение жанров сбрасывает кеш произведения.'
+        )
+        assert kept <= set(GenreTitle.objects.values_list('pk', flat=True)), (
+            'Проверьте, что при изменении жанров оставшиеся связи не '
+            'пересоздаются.'
+        )
+
+    def test_04_genre_title_is_through_model(self, client, admin_client):
+        from titles.models import Genre, GenreTitle, Title
+
+        create_categories(admin_client)
+        create_many_genres(admin_client, 1)
+        title = Title.objects.create(name='Сборник', year=2000)
+        GenreTitle.objects.create(title=title,
+                                  genre=Genre.objects.get())
+        response = client.get(f'{self.url}{title.pk}/')
+        assert response.json()['genre'] == [
+            {'name': 'Жанр 00', 'slug': 'genre-0'}
+        ], (
+            'Проверьте, что жанры произведения хранятся в модели GenreTitle.'
+        )
@@ -0,0 +1,136 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+def post_json(client, items):
+    return client.post(URL, data=json.dumps(items),
+                       content_type='application/json')
+
+
+def new_titles(count, **extra):
+    return [{'name': f'Произведение {number}', 'year': 2000 + number,
+             'genre': ['horror', 'drama'], 'category': 'films', **extra}
+            for number in range(count)]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21BulkTitles:
+
+    def test_01_only_admin(self, client, user_client, admin_client):
+        create_titles(admin_client)
+        for anonymous_or_user in (client, user_client):
+            response = post_json(anonymous_or_user, new_titles(1))
+            assert response.status_code in (HTTPStatus.UNAUTHORIZED,
+                                            HTTPStatus.FORBIDDEN), (
+                'Проверьте, что пакетная запись произведений доступна '
+                'только администратору.'
+            )
+
+    def test_02_bulk_create(self, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = post_json(admin_client, new_titles(20))
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert data['saved'] == 20 and data['failed'] == 0
+        assert [result['status'] for result in data['results']] == (
+            ['created'] * 20
+        )
+        genre_inserts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "titles_genretitle"')
+        ]
+        assert len(genre_inserts) == 1, (
+            'Проверьте, что связи с жанрами всей пачки записываются одним '
+            'INSERT.'
+        )
+        title = client.get(
+            f'/api/v1/titles/{data["results"][3]["id"]}/'
+        ).json()
+        assert title['name'] == 'Произведение 3'
+        assert [genre['slug'] for genre in title['genre']] == [
+            'drama', 'horror'
+        ]
+        assert client.get('/api/v1/titles/').json()['count'] == 22, (
+            'Проверьте, что пакетная запись сбрасывает кеш списков.'
+        )
+
+    def test_03_partial_failure(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        items = [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': ['comedy']},
+            new_titles(1)[0],
+            {'name': 'Без года', 'genre': ['horror'], 'category': 'films'},
+            {**new_titles(1)[0], 'genre': ['nope', 'horror', 'never']},
+            {'id': 10 ** 6, 'name': 'Нет такого'},
+            'не объект',
+        ]
+        response = post_json(admin_client, items)
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'updated', 'created', 'error', 'error', 'error', 'error'
+        ]
+        assert 'year' in results[2]['errors']
+        assert 'nope' in results[3]['errors']['genre'][0]
+        assert 'never' in results[3]['errors']['genre'][0], (
+            'Проверьте, что ошибка перечисляет все неизвестные slug.'
+        )
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['name'] == 'Терминатор 2'
+        assert title['year'] == titles[0]['year']
+        assert [genre['slug'] for genre in title['genre']] == ['comedy'], (
+            'Проверьте, что пакетное изменение сбрасывает кеш произведения.'
+        )
+        response = post_json(admin_client, items[2:])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_ndjson(self, client, admin_client):
+        create_titles(admin_client)
+        body = '\n'.join(json.dumps(item) for item in new_titles(3)) + '\n'
+        response = admin_client.post(URL, data=body,
+                                     content_type='application/x-ndjson')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакетная запись принимает NDJSON.'
+        )
+        assert response.json()['saved'] == 3
+        response = admin_client.post(URL, data='{"name": 1}\n{oops\n',
+                                     content_type='application/x-ndjson')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'строке 2' in response.json()['detail']
+
+    def test_05_duplicate_id(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        response = post_json(admin_client, [
+            {'id': title_id, 'genre': ['comedy']},
+            {'id': title_id, 'genre': ['drama']},
+            {'id': [title_id], 'name': 'Список'},
+            {'id': True, 'name': 'Логическое'},
+            {'id': 10 ** 30, 'name': 'Слишком большое'},
+        ])
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что повтор id в одной пачке не приводит к ошибке '
+            'сервера.'
+        )
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            'updated', 'error', 'error', 'error', 'error'
+        ], (
+            'Проверьте, что повтор id в пачке и id не целым числом из '
+            'диапазона ключа отклоняются как ошибки элементов.'
+        )
+        assert all('id' in result['errors'] for result in results[1:])
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert [genre['slug'] for genre in title['genre']] == ['comedy']
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def create_more_titles(admin_client, count):
+    return [admin_client.post('/api/v1/titles/', data={
+        'name': f'Произведение {number}', 'year': 2000,
+        'genre': ['horror', 'drama'], 'category': 'films',
+    }).json()['id'] for number in range(count)]
+
+
+def get_ids(client, title_ids):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(
+            f'/api/v1/titles/?ids={",".join(map(str, title_ids))}'
+        )
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['results'], len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22MultiGet:
+
+    def test_01_requested_order(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_ids = create_more_titles(admin_client, 3)
+        requested = [title_ids[2], titles[0]['id'], 10 ** 6, title_ids[0]]
+        results, _ = get_ids(client, requested)
+        assert [title['id'] for title in results] == [
+            title_ids[2], titles[0]['id'], title_ids[0]
+        ], (
+            'Проверьте, что `?ids=` возвращает произведения в порядке '
+            'запроса и пропускает несуществующие id.'
+        )
+        assert results[1] == client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        ).json()
+
+    def test_02_fixed_queries_and_cache(self, client, admin_client):
+        create_titles(admin_client)
+        title_ids = create_more_titles(admin_client, 12)
+        _, few = get_ids(client, title_ids[:2])
+        _, many = get_ids(client, title_ids[2:])
+        assert many == few <= 2, (
+            'Проверьте, что `?ids=` выполняет фиксированное число запросов.'
+        )
+        _, cached = get_ids(client, title_ids)
+        assert not cached, (
+            'Проверьте, что `?ids=` берет произведения из кеша.'
+        )
+        client.get(f'/api/v1/titles/{title_ids[0]}/')
+        admin_client.patch(f'/api/v1/titles/{title_ids[0]}/',
+                           data={'name': 'Новое название'})
+        results, _ = get_ids(client, title_ids[:1])
+        assert results[0]['name'] == 'Новое название'
+
+    def test_03_invalid_ids(self, client, admin_client):
+        create_titles(admin_client)
+        for ids in ('1,a', ','.join(map(str, range(1, 102))), '0',
+                    '-1', '1,99999999999999999999999'):
+            response = client.get(f'/api/v1/titles/?ids={ids}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,79 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+SAMPLE = {
+    'id': 1,
+    'name': 'Терминатор\u2028\u2029',
+    'rating': 6.333333333333333,
+    'price': Decimal('1.50'),
+    'message': gettext_lazy('Ошибка'),
+    'created': datetime(2020, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    7: [None, True, {'nested': []}],
+}
+
+
+class Test23FastJSON:
+
+    @pytest.mark.parametrize('use_orjson', (True, False))
+    def test_01_renderer_matches_drf(self, monkeypatch, use_orjson):
+        from api import renderers
+
+        if not use_orjson:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(SAMPLE) == (
+            JSONRenderer().render(SAMPLE)
+        ), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, что и '
+            'JSONRenderer.'
+        )
+        indented = 'application/json; indent=4'
+        assert renderers.FastJSONRenderer().render(SAMPLE, indented) == (
+            JSONRenderer().render(SAMPLE, indented)
+        )
+        assert renderers.FastJSONRenderer().render(None) == b''
+
+    @pytest.mark.parametrize('use_orjson', (True, False))
+    def test_02_parser_matches_drf(self, monkeypatch, use_orjson):
+        from api import parsers, renderers
+
+        if not use_orjson:
+            monkeypatch.setattr(parsers, 'orjson', None)
+        body = renderers.FastJSONRenderer().render(SAMPLE)
+        assert parsers.FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+        for broken in (b'{"a": ', b'{"a": NaN}'):
+            with pytest.raises(ParseError):
+                parsers.FastJSONParser().parse(io.BytesIO(broken))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_uses_fast_json(self, admin_client):
+        from api.parsers import FastJSONParser
+        from api.renderers import FastJSONRenderer
+        from rest_framework.settings import api_settings
+
+        assert FastJSONRenderer in api_settings.DEFAULT_RENDERER_CLASSES
+        assert FastJSONParser in api_settings.DEFAULT_PARSER_CLASSES
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": "Драма", "slug": "drama"}',
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        assert response.content == (
+            '{"name":"Драма","slug":"drama"}'.encode()
+        )
+
+    def test_04_benchmark(self, capsys):
+        call_command('benchmark_renderers', page_sizes=[5], repeat=1)
+        out = capsys.readouterr().out
+        assert 'titles, 5 на странице' in out
+        assert 'reviews, 5 на странице' in out
+        assert 'отличается' not in out
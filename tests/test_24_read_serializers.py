@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReadSerializers:
+
+    def test_01_identical_output(self, admin_client, admin, user_client,
+                                 user):
+        from api.read_serializers import (CommentReadSerializer,
+                                          ReviewReadSerializer,
+                                          TitleReadSerializer)
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleSerializer)
+        from reviews.models import Comment, Review
+        from titles.models import Title
+
+        _, _, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        create_single_review(admin_client, titles[1]['id'], 'text', 7)
+        for model, serializer_class, read_serializer_class in (
+            (Title, TitleSerializer, TitleReadSerializer),
+            (Review, ReviewSerializer, ReviewReadSerializer),
+            (Comment, CommentSerializer, CommentReadSerializer),
+        ):
+            queryset = model.objects.order_by('pk')
+            expected = JSONRenderer().render(
+                serializer_class(queryset, many=True).data
+            )
+            assert JSONRenderer().render(
+                read_serializer_class(queryset, many=True).data
+            ) == expected, (
+                f'Проверьте, что {read_serializer_class.__name__} выводит '
+                f'то же, что {serializer_class.__name__}.'
+            )
+            assert read_serializer_class(
+                queryset.values(*read_serializer_class.values).first()
+            ).data == serializer_class(queryset.first()).data
+
+    def test_02_views_use_read_serializers(self, client, admin_client,
+                                           admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        for url in ('/api/v1/titles/', title_url, f'{title_url}reviews/',
+                    review_url, f'{review_url}comments/',
+                    f'{review_url}comments/{comments[0]["id"]}/',
+                    '/api/v1/titles/?pagination=cursor'):
+            assert client.get(url).status_code == 200
+            response = admin_client.get(url, HTTP_ACCEPT='text/html')
+            assert response.status_code == 200, (
+                f'Проверьте, что Browsable API для `{url}` открывается.'
+            )
+        assert client.get(f'{title_url}reviews/{10 ** 6}/').status_code == 404
+        for url in ('/api/v1/titles/abc/', f'{title_url}reviews/abc/',
+                    f'{review_url}comments/abc/',
+                    '/api/v1/titles/abc/reviews/',
+                    '/api/v1/titles/abc/reviews/1/comments/'):
+            assert client.get(url).status_code == 404, (
+                f'Проверьте, что GET-запрос к `{url}` с нечисловым id '
+                f'возвращает статус 404.'
+            )
+
+    def test_03_benchmark(self, admin_client, admin, capsys):
+        create_comments(admin_client, {admin: admin_client})
+        call_command('benchmark_read_serializers', page_sizes=[5],
+                     repeat=1)
+        out = capsys.readouterr().out
+        for name in ('titles', 'reviews', 'comments'):
+            assert f'{name}, ' in out
+        assert 'отличается' not in out
@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_comments, create_titles
+
+
+def get_sql(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает статус 200.'
+    )
+    return response.json(), [query['sql'] for query in
+                             context.captured_queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SparseFields:
+
+    def test_01_title_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data, queries = get_sql(client,
+                                '/api/v1/titles/?fields=id,name,rating')
+        assert all(set(title) == {'id', 'name', 'rating'}
+                   for title in data['results']), (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'запрошенные поля.'
+        )
+        assert not any('description' in sql or 'genre' in sql
+                       for sql in queries), (
+            'Проверьте, что без запрошенных описания и жанров они не '
+            'загружаются из базы.'
+        )
+        data, _ = get_sql(client, '/api/v1/titles/?exclude=description,genre')
+        assert set(data['results'][0]) == {'id', 'name', 'year', 'rating',
+                                           'category'}, (
+            'Проверьте, что `?exclude=` убирает поля из ответа.'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        full = client.get(url).json()
+        data, queries = get_sql(client, f'{url}?fields=genre')
+        assert data == {'genre': full['genre']}
+        assert not queries, (
+            'Проверьте, что `?fields=` у произведения берется из кеша.'
+        )
+        assert client.get(url).json() == full
+        data, _ = get_sql(client, f'/api/v1/titles/?ids={titles[0]["id"]}'
+                                  f'&fields=name')
+        assert data['results'] == [{'name': full['name']}]
+
+    def test_02_unknown_field(self, client, admin_client):
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/?fields=name,secret',
+                    '/api/v1/categories/?exclude=secret',
+                    '/api/v1/titles/1/reviews/?fields=secret'):
+            response = client.get(url)
+            assert response.status_code == 400, (
+                f'Проверьте, что неизвестное поле в `{url}` возвращает '
+                f'статус 400.'
+            )
+
+    def test_03_cache_params(self, client):
+        from titles.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000)
+            for number in range(7)
+        )
+        full = client.get('/api/v1/titles/')
+        sparse = client.get('/api/v1/titles/?fields=name')
+        assert set(sparse.json()['results'][0]) == {'name'}, (
+            'Проверьте, что `?fields=` учитывается в ключе кеша списка.'
+        )
+        assert full['ETag'] != sparse['ETag'], (
+            'Проверьте, что `?fields=` учитывается в ETag.'
+        )
+        data, _ = get_sql(client, '/api/v1/titles/?fields=name'
+                                  '&pagination=cursor')
+        assert set(data['results'][0]) == {'name'}
+        assert data['next'] is not None
+
+    def test_04_reviews_and_comments(self, client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, queries = get_sql(client, f'{url}?fields=id,score')
+        assert set(data['results'][0]) == {'id', 'score'}
+        assert not any('users_user' in sql for sql in queries), (
+            'Проверьте, что без поля `author` автор не загружается.'
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        data, _ = get_sql(client, f'{url}{comments[0]["id"]}/?exclude=text')
+        assert set(data) == {'id', 'author', 'pub_date', 'review'}
+
+    def test_05_other_viewsets(self, client, admin_client):
+        create_categories(admin_client)
+        data, queries = get_sql(client, '/api/v1/categories/?fields=slug')
+        assert all(set(category) == {'slug'}
+                   for category in data['results'])
+        assert '"name"' not in queries[-1].split('FROM')[0], (
+            'Проверьте, что `?fields=` сужает список столбцов запроса.'
+        )
+        data, _ = get_sql(admin_client, '/api/v1/users/?fields=username,role')
+        assert set(data['results'][0]) == {'username', 'role'}
@@ -0,0 +1,94 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+FORMATS = {
+    'application/msgpack': 'msgpack',
+    'application/cbor': 'cbor2',
+}
+
+
+def get_codec(media_type):
+    module = pytest.importorskip(FORMATS[media_type])
+    if media_type == 'application/msgpack':
+        return module.packb, module.unpackb
+    return module.dumps, module.loads
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26BinaryFormats:
+
+    @pytest.mark.parametrize('media_type', FORMATS)
+    def test_01_negotiation(self, client, admin_client, admin, media_type):
+        _, loads = get_codec(media_type)
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/',
+                    f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            json_response = client.get(url)
+            response = client.get(url, HTTP_ACCEPT=media_type)
+            assert response['Content-Type'] == media_type, (
+                f'Проверьте, что `{url}` отдает {media_type} по заголовку '
+                f'Accept.'
+            )
+            assert loads(response.content) == json_response.json(), (
+                f'Проверьте, что ответ в {media_type} содержит те же данные, '
+                f'что и JSON.'
+            )
+            assert response['ETag'] != json_response['ETag'], (
+                'Проверьте, что ETag различается для разных форматов.'
+            )
+            assert client.get(
+                url, HTTP_ACCEPT=media_type,
+                HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code == 304
+        assert client.get('/api/v1/titles/')['Content-Type'] == (
+            'application/json'
+        ), 'Проверьте, что по умолчанию ответ отдается в JSON.'
+
+    @pytest.mark.parametrize('media_type', FORMATS)
+    def test_02_parser(self, admin_client, media_type):
+        dumps, loads = get_codec(media_type)
+        data = {'name': 'Категория', 'slug': 'binary'}
+        response = admin_client.post('/api/v1/categories/',
+                                     data=dumps(data),
+                                     content_type=media_type,
+                                     HTTP_ACCEPT=media_type)
+        assert response.status_code == 201, (
+            f'Проверьте, что API принимает тело запроса в {media_type}.'
+        )
+        assert loads(response.content) == data
+        response = admin_client.post('/api/v1/categories/',
+                                     data=b'\xc1\xff\x00',
+                                     content_type=media_type)
+        assert response.status_code == 400, (
+            f'Проверьте, что неверное тело в {media_type} возвращает '
+            f'статус 400.'
+        )
+
+    def test_03_missing_package(self, monkeypatch):
+        from api import renderers
+
+        monkeypatch.setattr(renderers, 'msgpack', None)
+        with pytest.raises(ImproperlyConfigured):
+            renderers.MessagePackRenderer().render({'id': 1})
+
+    def test_04_benchmark(self, capsys):
+        call_command('benchmark_formats', page_sizes=[5], repeat=1)
+        out = capsys.readouterr().out
+        for name in ('titles', 'reviews'):
+            assert f'{name}, 5 на странице, JSON' in out
+        assert 'не совпадает' not in out
+
+    def test_05_abstract_renderer(self):
+        from api.renderers import BinaryRenderer
+
+        with pytest.raises(TypeError):
+            BinaryRenderer()
+
+        class IncompleteRenderer(BinaryRenderer):
+            media_type = 'application/x-incomplete'
+
+        with pytest.raises(TypeError):
+            IncompleteRenderer()
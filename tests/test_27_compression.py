@@ -0,0 +1,132 @@
+import gzip
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/'
+
+
+def create_long_titles():
+    from titles.models import Title
+
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=2000,
+              description='Длинное описание произведения. ' * 20)
+        for number in range(5)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Compression:
+
+    def test_01_gzip(self, client):
+        create_long_titles()
+        plain = client.get(URL)
+        response = client.get(URL, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большой JSON-ответ сжимается gzip.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(response.content) == plain.content
+        assert int(response['Content-Length']) < len(plain.content)
+        assert response['ETag'] == f'W/{plain["ETag"]}', (
+            'Проверьте, что ETag сжатого ответа становится слабым.'
+        )
+        assert client.get(
+            URL, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 304
+        assert not client.get(URL).has_header('Content-Encoding')
+        assert not client.get(
+            URL, HTTP_ACCEPT_ENCODING='gzip;q=0, identity'
+        ).has_header('Content-Encoding'), (
+            'Проверьте, что кодировка с q=0 не используется.'
+        )
+
+    def test_02_threshold_and_types(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(response.content) < 1024
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше COMPRESSION_MIN_SIZE не сжимаются.'
+        )
+        with override_settings(COMPRESSION_MIN_SIZE=10):
+            assert client.get(
+                URL, HTTP_ACCEPT_ENCODING='gzip'
+            )['Content-Encoding'] == 'gzip'
+            with override_settings(COMPRESSION_CONTENT_TYPES=('text/csv',)):
+                assert not client.get(
+                    URL, HTTP_ACCEPT_ENCODING='gzip'
+                ).has_header('Content-Encoding'), (
+                    'Проверьте, что сжимаются только типы из '
+                    'COMPRESSION_CONTENT_TYPES.'
+                )
+
+    def test_03_cached_body(self, client, monkeypatch):
+        from api.middleware import GzipCodec
+
+        create_long_titles()
+        compressed = []
+        compress = GzipCodec.compress
+
+        def counting_compress(codec, data):
+            compressed.append(data)
+            return compress(codec, data)
+
+        monkeypatch.setattr(GzipCodec, 'compress', counting_compress)
+        bodies = {client.get(URL, HTTP_ACCEPT_ENCODING='gzip').content
+                  for _ in range(3)}
+        assert len(bodies) == 1
+        assert len(compressed) == 1, (
+            'Проверьте, что сжатое тело ответа из кеша списков не '
+            'сжимается повторно.'
+        )
+        client.get(f'{URL}?ordering=year', HTTP_ACCEPT_ENCODING='gzip')
+        assert len(compressed) == 2
+
+    def test_04_streaming(self, admin_client):
+        create_long_titles()
+        response = admin_client.get(f'{URL}export/',
+                                    HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что потоковая выгрузка сжимается.'
+        )
+        lines = gzip.decompress(
+            b''.join(response.streaming_content)
+        ).splitlines()
+        assert len(lines) == 5
+
+    @pytest.mark.parametrize('encoding, package', (('br', 'brotli'),
+                                                   ('zstd', 'zstandard')))
+    def test_05_optional_codecs(self, client, encoding, package):
+        module = pytest.importorskip(package)
+        create_long_titles()
+        plain = client.get(URL).content
+        response = client.get(
+            URL, HTTP_ACCEPT_ENCODING=f'gzip;q=0.5, {encoding}'
+        )
+        assert response['Content-Encoding'] == encoding, (
+            f'Проверьте, что при установленном {package} ответ сжимается '
+            f'{encoding}.'
+        )
+        if encoding == 'br':
+            assert module.decompress(response.content) == plain
+        else:
+            assert module.ZstdDecompressor().decompress(
+                response.content
+            ) == plain
+
+    def test_06_abstract_codec(self):
+        from api.middleware import Codec
+
+        class StreamOnlyCodec(Codec):
+            encoding = 'stream-only'
+
+            def compressor(self):
+                return bytes, bytes
+
+        for codec_class in (Codec, StreamOnlyCodec):
+            with pytest.raises(TypeError):
+                codec_class()
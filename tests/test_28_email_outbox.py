@@ -0,0 +1,217 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+
+
+def queue(count):
+    from users.models import OutboxEmail
+
+    return OutboxEmail.objects.bulk_create(
+        OutboxEmail(to=f'user{number}@yamdb.fake', subject='Тема',
+                    body='Текст')
+        for number in range(count)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28EmailOutbox:
+
+    @pytest.fixture(autouse=True)
+    def lazy_outbox(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_BACKOFF = 30
+
+    def test_01_signup_enqueues(self, client):
+        from users.models import OutboxEmail
+
+        response = client.post(URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что signup не отправляет письмо сам, а ставит его '
+            'в очередь.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.to == 'valid@yamdb.fake'
+        assert email.status == OutboxEmail.PENDING
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда send_emails отправляет письма из '
+            'очереди.'
+        )
+        assert mail.outbox[0].to == ['valid@yamdb.fake']
+        assert 'Код подтверждения' in mail.outbox[0].body
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.SENT and email.sent_at
+        assert not email.body, (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения стирается.'
+        )
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не уходит повторно.'
+        )
+
+    @pytest.mark.parametrize('workers', (1, 3))
+    def test_02_batches_share_connection(self, monkeypatch, workers):
+        opened = []
+        open_connection = EmailBackend.open
+
+        def counting_open(backend):
+            opened.append(backend)
+            return open_connection(backend)
+
+        monkeypatch.setattr(EmailBackend, 'open', counting_open)
+        queue(25)
+        call_command('send_emails', once=True, workers=workers,
+                     batch_size=10)
+        assert len(mail.outbox) == 25
+        assert len(opened) == 3, (
+            'Проверьте, что пачка писем отправляется через одно '
+            'соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, monkeypatch, settings, capsys):
+        from users.models import OutboxEmail
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        send_messages = EmailBackend.send_messages
+        failing = {'user0@yamdb.fake'}
+
+        def flaky_send(backend, messages):
+            if messages[0].to[0] in failing:
+                raise SMTPException('Сервер недоступен')
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', flaky_send)
+        queue(2)
+        started = timezone.now()
+        call_command('send_emails', once=True)
+        assert 'Отправлено 1, отложено 1, не отправлено 0' in (
+            capsys.readouterr().out
+        )
+        email = OutboxEmail.objects.get(to='user0@yamdb.fake')
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1
+        assert 'Сервер недоступен' in email.last_error
+        assert email.next_attempt_at >= started + timedelta(seconds=30), (
+            'Проверьте, что после ошибки отправка откладывается.'
+        )
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо не отправляется до истечения паузы.'
+        )
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', once=True)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.FAILED, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
+        assert not email.body
+        failing.clear()
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1
+
+    def test_04_backoff_doubles(self, settings):
+        from users.outbox import backoff
+
+        settings.EMAIL_OUTBOX_MAX_BACKOFF = 100
+        assert [backoff(attempts).total_seconds()
+                for attempts in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+    def test_05_any_exception_is_recorded(self, monkeypatch):
+        from users.models import OutboxEmail
+
+        send_messages = EmailBackend.send_messages
+
+        def broken_send(backend, messages):
+            if messages[0].to[0] == 'user0@yamdb.fake':
+                raise ValueError('Неверный заголовок')
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        queue(2)
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что ошибка одного письма не прерывает пачку.'
+        )
+        email = OutboxEmail.objects.get(to='user0@yamdb.fake')
+        assert email.status == OutboxEmail.PENDING and email.attempts == 1
+        assert 'Неверный заголовок' in email.last_error
+        assert email.body, (
+            'Проверьте, что текст письма сохраняется до повторной попытки.'
+        )
+
+        def broken_open(backend):
+            raise RuntimeError('Нет настроек')
+
+        monkeypatch.setattr(EmailBackend, 'open', broken_open)
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', once=True)
+        email.refresh_from_db()
+        assert email.attempts == 2 and 'Нет настроек' in email.last_error, (
+            'Проверьте, что ошибка открытия соединения записывается в '
+            'письма пачки.'
+        )
+
+    @pytest.mark.parametrize('reconnects', (True, False))
+    def test_06_disconnect_mid_batch(self, monkeypatch, reconnects):
+        from smtplib import SMTPServerDisconnected
+
+        from users.models import OutboxEmail
+
+        send_messages = EmailBackend.send_messages
+        opened = []
+
+        def tracking_open(backend):
+            if opened and not reconnects:
+                raise SMTPServerDisconnected('Сервер недоступен')
+            opened.append(backend)
+            backend.alive = True
+
+        def tracking_close(backend):
+            backend.alive = False
+
+        def dropping_send(backend, messages):
+            if not getattr(backend, 'alive', False):
+                raise SMTPServerDisconnected('Соединение закрыто')
+            if messages[0].to[0] == 'user1@yamdb.fake':
+                backend.alive = False
+                raise SMTPServerDisconnected('Соединение оборвалось')
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'open', tracking_open)
+        monkeypatch.setattr(EmailBackend, 'close', tracking_close)
+        monkeypatch.setattr(EmailBackend, 'send_messages', dropping_send)
+        queue(4)
+        call_command('send_emails', once=True)
+        broken = OutboxEmail.objects.get(to='user1@yamdb.fake')
+        assert broken.status == OutboxEmail.PENDING
+        assert broken.attempts == 1
+        rest = OutboxEmail.objects.filter(
+            to__in=['user2@yamdb.fake', 'user3@yamdb.fake']
+        )
+        if reconnects:
+            assert len(mail.outbox) == 3, (
+                'Проверьте, что после обрыва соединение открывается заново '
+                'и остальные письма пачки отправляются.'
+            )
+            assert all(email.status == OutboxEmail.SENT for email in rest)
+        else:
+            assert len(mail.outbox) == 1
+            assert all(email.status == OutboxEmail.PENDING
+                       and email.attempts == 0
+                       for email in rest), (
+                'Проверьте, что письма после обрыва соединения остаются в '
+                'очереди без траты попытки.'
+            )